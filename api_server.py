@@ -1,21 +1,34 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, request
 from flask_cors import CORS
 from pipeline.pipeline import DataPipeline
 from pipeline.config import Config
+import numpy as np
+import orjson
+from collections import deque
+from itertools import islice
 import threading
 import time
 
 app = Flask(__name__)
 CORS(app)  # Allow frontend to access
 
-# Storage for radar data
-radar_data = {
+def ojsonify(obj):
+    """jsonify replacement - orjson encodes nested sensor dicts in C"""
+    return Response(
+        orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY),
+        mimetype='application/json'
+    )
+
+# Storage for radar data - kept as (dict, encoded bytes) so GETs can
+# return the cached encoding instead of re-serializing per request
+_initial_radar = {
     'presence': 0,
     'distance_cm': 0,
     'moving': False,
     'stationary': False,
     'timestamp': 0
 }
+radar_state = (_initial_radar, orjson.dumps(_initial_radar))
 
 # Start pipeline in background
 config = Config()
@@ -35,119 +48,201 @@ def get_latest():
     """Get latest data from both modules"""
     db = pipeline.get_database()
     
-    return jsonify({
+    return ojsonify({
         'bed': db.get_latest_bed(),
         'hand': db.get_latest_hand(),
         'timestamp': time.time()
     })
 
+# Encoded history responses keyed on (seconds, 250ms time bucket) -
+# dashboards polling the same window hit cache until the bucket rolls
+# over. FIFO-evicted dict; atomic ops under the GIL, no lock needed.
+_history_cache = {}
+_HISTORY_CACHE_MAX = 32
+
 @app.route('/api/history/<int:seconds>', methods=['GET'])
 def get_history(seconds):
     """Get historical data for last N seconds"""
-    db = pipeline.get_database()
-    
-    return jsonify({
-        'bed': db.get_bed_history(seconds=seconds),
-        'hand': db.get_hand_history(seconds=seconds),
-        'duration_seconds': seconds
-    })
+    key = (seconds, int(time.time() * 4))
+    body = _history_cache.get(key)
+
+    if body is None:
+        db = pipeline.get_database()
+        body = orjson.dumps({
+            'bed': db.get_bed_history(seconds=seconds),
+            'hand': db.get_hand_history(seconds=seconds),
+            'duration_seconds': seconds
+        })
+        if len(_history_cache) >= _HISTORY_CACHE_MAX:
+            _history_cache.pop(next(iter(_history_cache)), None)
+        _history_cache[key] = body
+
+    return Response(body, mimetype='application/json')
+
+def _nearest_indices(source_ts, target_ts):
+    """
+    For each timestamp in source_ts, find the index of the nearest
+    timestamp in target_ts. Both arrays must be sorted (readers append
+    in time order, so history slices already are). Vectorized with
+    searchsorted so the whole batch runs in one C-level pass.
+    """
+    if len(target_ts) == 0:
+        # Nothing to match against (e.g. one reader has no samples
+        # yet during an outage or cold start)
+        return []
+    if len(target_ts) == 1:
+        return [0] * len(source_ts)
+    idx = np.searchsorted(target_ts, source_ts).clip(1, len(target_ts) - 1)
+    left = idx - 1
+    choose = np.where(
+        np.abs(target_ts[left] - source_ts) <= np.abs(target_ts[idx] - source_ts),
+        left, idx
+    )
+    return choose.tolist()
+
+# Cache last merge result - repeated dashboard polls between new
+# samples see identical histories and can reuse the previous answer
+_merge_cache = {'key': None, 'result': None}
 
 @app.route('/api/merged/<int:seconds>', methods=['GET'])
 def get_merged(seconds):
     """Get merged data aligned by timestamp"""
     db = pipeline.get_database()
-    
+
     bed_data = db.get_bed_history(seconds=seconds)
     hand_data = db.get_hand_history(seconds=seconds)
-    
-    # Merge by timestamp (simple approach - match closest timestamps)
+
+    # Merge by timestamp - nearest neighbor via vectorized searchsorted
+    # instead of a full scan per bed point (was O(N*M))
+    bed_ts = np.fromiter(
+        (b.get('received_at', 0) for b in bed_data),
+        dtype=np.float64, count=len(bed_data)
+    )
+    hand_ts = np.fromiter(
+        (h.get('received_at', 0) for h in hand_data),
+        dtype=np.float64, count=len(hand_data)
+    )
+
+    cache_key = (
+        seconds,
+        bed_ts[-1] if len(bed_ts) else None,
+        hand_ts[-1] if len(hand_ts) else None,
+        len(bed_ts),
+        len(hand_ts)
+    )
+    if _merge_cache['key'] == cache_key:
+        return ojsonify(_merge_cache['result'])
+
     merged = []
-    for bed_point in bed_data:
-        # Find closest hand point
-        bed_ts = bed_point.get('received_at', 0)
-        closest_hand = min(hand_data, 
-                          key=lambda h: abs(h.get('received_at', 0) - bed_ts),
-                          default=None)
-        
-        merged.append({
-            'timestamp': bed_ts,
-            'bed': bed_point,
-            'hand': closest_hand
-        })
-    
-    return jsonify({
+    if hand_data:
+        forward = _nearest_indices(bed_ts, hand_ts)
+        # Mutual-nearest bijection check: only keep a pairing if the
+        # hand point also picks this bed point as its nearest neighbor,
+        # so stale hand samples don't get matched to every bed point
+        reverse = _nearest_indices(hand_ts, bed_ts)
+        for i, bed_point in enumerate(bed_data):
+            j = forward[i]
+            closest_hand = hand_data[j] if reverse[j] == i else None
+            merged.append({
+                'timestamp': bed_point.get('received_at', 0),
+                'bed': bed_point,
+                'hand': closest_hand
+            })
+    else:
+        for bed_point in bed_data:
+            merged.append({
+                'timestamp': bed_point.get('received_at', 0),
+                'bed': bed_point,
+                'hand': None
+            })
+
+    result = {
         'data': merged,
         'count': len(merged)
-    })
+    }
+    _merge_cache['key'] = cache_key
+    _merge_cache['result'] = result
+
+    return ojsonify(result)
 
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get pipeline statistics"""
-    return jsonify(pipeline.get_stats())
+    return ojsonify(pipeline.get_stats_cached())
 
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    stats = pipeline.get_stats()
-    return jsonify({
+    flags = pipeline.is_healthy()
+    return ojsonify({
         'status': 'ok',
-        'bed_connected': stats['bed_reader']['connected'],
-        'hand_connected': stats['hand_reader']['connected']
+        'bed_connected': flags['bed_connected'],
+        'hand_connected': flags['hand_connected']
     })
 
 # Storage for transcripts (in-memory)
-transcripts = []
+# deque(maxlen=100) drops the oldest entry atomically on append, so
+# concurrent POSTs under Flask's threaded server can't corrupt the list
+transcripts = deque(maxlen=100)
+_transcript_lock = threading.Lock()
+_transcript_count = 0
 
 @app.route('/api/transcript', methods=['POST'])
 def add_transcript():
     """Receive transcript from Raspberry Pi"""
+    global _transcript_count
     data = request.json
-    
-    transcript = {
-        'text': data.get('text', ''),
-        'timestamp': data.get('timestamp', time.time()),
-        'source': data.get('source', 'voice'),
-        'id': len(transcripts) + 1
-    }
-    
-    transcripts.append(transcript)
-    
-    # Keep only last 100 transcripts
-    if len(transcripts) > 100:
-        transcripts.pop(0)
-    
+
+    with _transcript_lock:
+        _transcript_count += 1
+        transcript = {
+            'text': data.get('text', ''),
+            'timestamp': data.get('timestamp', time.time()),
+            'source': data.get('source', 'voice'),
+            'id': _transcript_count
+        }
+        transcripts.append(transcript)
+
     print(f"[TRANSCRIPT] {transcript['text']}")
-    
-    return jsonify({'status': 'ok', 'id': transcript['id']}), 200
+
+    return ojsonify({'status': 'ok', 'id': transcript['id']}), 200
 
 @app.route('/api/transcripts/latest', methods=['GET'])
 def get_latest_transcripts():
     """Get latest transcripts for AI team"""
     limit = request.args.get('limit', 10, type=int)
-    return jsonify({
-        'transcripts': transcripts[-limit:],
-        'count': len(transcripts[-limit:])
+    # islice from the tail - no intermediate full-list copy
+    n = min(max(limit, 0), len(transcripts))
+    tail = list(islice(transcripts, len(transcripts) - n, None))
+    return ojsonify({
+        'transcripts': tail,
+        'count': n
     })
 
 @app.route('/api/transcripts/all', methods=['GET'])
 def get_all_transcripts():
     """Get all transcripts"""
-    return jsonify({
-        'transcripts': transcripts,
-        'count': len(transcripts)
+    snapshot = list(transcripts)
+    return ojsonify({
+        'transcripts': snapshot,
+        'count': len(snapshot)
     })
 @app.route('/api/radar', methods=['POST'])
 def receive_radar():
-    global radar_data
+    global radar_state
     try:
-        radar_data = request.json
-        return jsonify({'status': 'ok'})
+        # Encode once at POST time; single tuple assignment is atomic
+        # in CPython, so readers never observe a half-written pair
+        data = request.json
+        radar_state = (data, orjson.dumps(data))
+        return ojsonify({'status': 'ok'})
     except Exception as e:
-        return jsonify({'status': 'error', 'message': str(e)}), 400
+        return ojsonify({'status': 'error', 'message': str(e)}), 400
 
 @app.route('/api/radar/latest', methods=['GET'])
 def get_radar():
-    return jsonify(radar_data)
+    # Serve the bytes cached at POST time - no per-GET re-encode
+    return Response(radar_state[1], mimetype='application/json')
 
 if __name__ == '__main__':
     print("\n" + "="*60)
@@ -160,6 +255,10 @@ if __name__ == '__main__':
     print("  GET /api/stats           - Pipeline statistics")
     print("  GET /api/health          - Health check")
     print("\nStarting server on http://localhost:8000")
+    print("For production use:")
+    print("  gunicorn --workers 1 --threads 16 --worker-class gthread \\")
+    print("           --bind 0.0.0.0:8000 api_server:app")
+    print("(single worker - the pipeline lives in process memory)")
     print("="*60 + "\n")
-    
-    app.run(host='0.0.0.0', port=8000, debug=False)
+
+    app.run(host='0.0.0.0', port=8000, debug=False, threaded=True)
@@ -4,9 +4,10 @@ Guardian Bed - Data Merger
 Collects data from 3 ESP32s, merges by timestamp, saves every 30 seconds
 """
 import requests
-import json
+import orjson
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # ====== CONFIGURATION ======
@@ -29,11 +30,15 @@ class DataMerger:
         }
         self.running = False
         self.thread = None
-        
+        # One pooled session + worker pool so the per-cycle fetches run
+        # concurrently (wall time ~ slowest device, not the sum of all)
+        self.session = requests.Session()
+        self.executor = ThreadPoolExecutor(max_workers=5)
+
     def fetch_esp32(self, ip, name):
         """Fetch data from an ESP32"""
         try:
-            response = requests.get(f"http://{ip}/data", timeout=2)
+            response = self.session.get(f"http://{ip}/data", timeout=2)
             if response.status_code == 200:
                 data = response.json()
                 print(f"✓ {name}: {data.get('module', 'unknown')}")
@@ -45,7 +50,7 @@ class DataMerger:
     def fetch_voice_transcripts(self):
         """Fetch latest voice transcript from API"""
         try:
-            response = requests.get("http://localhost:8000/api/transcripts/latest?limit=1", timeout=2)
+            response = self.session.get("http://localhost:8000/api/transcripts/latest?limit=1", timeout=2)
             if response.status_code == 200:
                 data = response.json()
                 if data.get('transcripts'):
@@ -57,7 +62,7 @@ class DataMerger:
     def fetch_radar_data(self):
         """Fetch latest radar data from API"""
         try:
-            response = requests.get("http://localhost:8000/api/radar/latest", timeout=2)
+            response = self.session.get("http://localhost:8000/api/radar/latest", timeout=2)
             if response.status_code == 200:
                 data = response.json()
                 if data.get('timestamp', 0) > 0:  # Check if we have real data
@@ -79,12 +84,16 @@ class DataMerger:
         # Get unified timestamp FIRST (so all modules use the same time)
         unified_timestamp = time.time()
         
-        # Fetch from all ESP32s
-        bed1 = self.fetch_esp32(ESP32_BED1_IP, "Bed ESP32 #1")
-        bed2 = self.fetch_esp32(ESP32_BED2_IP, "Bed ESP32 #2")
-        hand = self.fetch_esp32(ESP32_HAND_IP, "Hand Module")
-        voice = self.fetch_voice_transcripts()
-        radar = self.fetch_radar_data()
+        # Fetch from all ESP32s concurrently - each device can take up
+        # to the 2s timeout, so sequential fetches stall the whole cycle
+        futures = [
+            self.executor.submit(self.fetch_esp32, ESP32_BED1_IP, "Bed ESP32 #1"),
+            self.executor.submit(self.fetch_esp32, ESP32_BED2_IP, "Bed ESP32 #2"),
+            self.executor.submit(self.fetch_esp32, ESP32_HAND_IP, "Hand Module"),
+            self.executor.submit(self.fetch_voice_transcripts),
+            self.executor.submit(self.fetch_radar_data),
+        ]
+        bed1, bed2, hand, voice, radar = [f.result() for f in futures]
         
         # Add unified timestamp to each module
         if bed1:
@@ -116,8 +125,8 @@ class DataMerger:
     def save_to_file(self):
         """Save merged data to JSON file"""
         try:
-            with open(OUTPUT_FILE, 'w') as f:
-                json.dump(self.latest_data, f, indent=2)
+            with open(OUTPUT_FILE, 'wb') as f:
+                f.write(orjson.dumps(self.latest_data, option=orjson.OPT_INDENT_2))
             print(f"💾 Saved to {OUTPUT_FILE}")
         except Exception as e:
             print(f"✗ Save failed: {e}")
@@ -162,6 +171,8 @@ class DataMerger:
         self.running = False
         if self.thread:
             self.thread.join()
+        self.executor.shutdown(wait=False)
+        self.session.close()
 
 def main():
     import os
@@ -1,10 +1,11 @@
+import sys
 import time
 import threading
 import logging
+from queue import Queue, Empty
 from typing import Dict
 
-from .readers.bed_reader import BedReader
-from pipeline.readers.hand_reader import HandReader
+from .readers.http_poll_reader import HttpPollReader
 from .readers.radar_reader import RadarReader
 from .storage.time_series_db import TimeSeriesDB
 from .storage.file_logger import FileLogger
@@ -16,6 +17,46 @@ logging.basicConfig(
 )
 logger = logging.getLogger("Pipeline")
 
+# Prebuilt stats report - one format + one stdout write instead of a
+# print call (and stdout lock acquire) per line
+STATS_TEMPLATE = """
+============================================================
+PIPELINE STATISTICS
+============================================================
+
+Bed Reader:
+  Connected: {br[connected]}
+  Total reads: {br[total_reads]}
+  Errors: {br[error_count]}
+  Queue size: {br[queue_size]}
+
+Hand Reader:
+  Connected: {hr[connected]}
+  Total reads: {hr[total_reads]}
+  Errors: {hr[error_count]}
+  Queue size: {hr[queue_size]}
+
+Radar Reader:
+  Connected: {rr[connected]}
+  Total reads: {rr[total_reads]}
+  Errors: {rr[error_count]}
+  Queue size: {rr[queue_size]}
+
+Database:
+  Total stored: {db[total_stored]}
+  Bed points: {db[bed_points]}
+  Hand points: {db[hand_points]}
+  Radar points: {db[radar_points]}
+"""
+
+FILE_LOGGER_TEMPLATE = """
+File Logger:
+  Total written: {fl[total_written]}
+  Current file: {fl[current_file]}
+"""
+
+STATS_FOOTER = "============================================================\n\n"
+
 class DataPipeline:
     """
     Main data pipeline coordinator
@@ -28,14 +69,25 @@ class DataPipeline:
     
     def __init__(self, config: Config):
         self.config = config
-        
+
+        # Single ingest queue shared by all readers - the processor
+        # blocks on it instead of polling three per-reader queues
+        self.ingest_queue = Queue()
+
         # Create readers
-        self.bed_reader = BedReader(config.BED_ESP32_IP, config.BED_POLL_RATE_HZ)
-        self.hand_reader = HandReader(config.HAND_ESP32_IP, config.HAND_POLL_RATE_HZ)
+        self.bed_reader = HttpPollReader(
+            'bed', config.BED_ESP32_IP, config.BED_POLL_RATE_HZ,
+            sink=self.ingest_queue
+        )
+        self.hand_reader = HttpPollReader(
+            'hand', config.HAND_ESP32_IP, config.HAND_POLL_RATE_HZ,
+            sink=self.ingest_queue
+        )
         self.radar_reader = RadarReader(
             config.RADAR_PORT,
             config.RADAR_BAUDRATE,
-            config.RADAR_POLL_RATE_HZ
+            config.RADAR_POLL_RATE_HZ,
+            sink=self.ingest_queue
         )
         
         # Create storage
@@ -49,6 +101,10 @@ class DataPipeline:
         # Control
         self.running = False
         self.processor_thread = None
+
+        # Short-TTL stats cache so health-check bursts don't rebuild
+        # the same dict (and take every component's lock) per request
+        self._stats_cache = (0.0, None)
         
     def start(self):
         """Start the entire pipeline"""
@@ -107,38 +163,44 @@ class DataPipeline:
         Background thread that moves data from reader queues to storage
         """
         logger.info("Processor thread started")
-        
+
+        dispatch = {
+            'bed': self.db.insert_bed_many,
+            'hand': self.db.insert_hand_many,
+            'radar': self.db.insert_radar_many
+        }
+
         while self.running:
             try:
-                # Process bed data
-                bed_queue = self.bed_reader.get_queue()
-                while not bed_queue.empty():
-                    data = bed_queue.get_nowait()
-                    self.db.insert_bed(data)
-                    if self.file_logger:
-                        self.file_logger.log(data)
-                        
-                # Process hand data
-                hand_queue = self.hand_reader.get_queue()
-                while not hand_queue.empty():
-                    data = hand_queue.get_nowait()
-                    self.db.insert_hand(data)
-                    if self.file_logger:
-                        self.file_logger.log(data)
-                        
-                # Process radar data
-                radar_queue = self.radar_reader.get_queue()
-                while not radar_queue.empty():
-                    data = radar_queue.get_nowait()
-                    self.db.insert_radar(data)
-                    if self.file_logger:
-                        self.file_logger.log(data)
-                        
+                # Block until data arrives - no busy-wait when idle
+                try:
+                    source, data = self.ingest_queue.get(timeout=0.5)
+                except Empty:
+                    continue
+
+                # Batch-drain whatever else is queued before re-blocking
+                batch = [(source, data)]
+                while len(batch) < 256:
+                    try:
+                        batch.append(self.ingest_queue.get_nowait())
+                    except Empty:
+                        break
+
+                # One bulk insert per source per wakeup - a single lock
+                # acquire instead of one per item
+                by_source = {}
+                for source, data in batch:
+                    by_source.setdefault(source, []).append(data)
+
+                for source, items in by_source.items():
+                    dispatch[source](items)
+
+                if self.file_logger:
+                    self.file_logger.log_many([data for _, data in batch])
+
             except Exception as e:
                 logger.error(f"Processor error: {e}")
-                
-            time.sleep(0.01)
-            
+
         logger.info("Processor thread stopped")
         
     def get_database(self) -> TimeSeriesDB:
@@ -156,44 +218,36 @@ class DataPipeline:
         
         if self.file_logger:
             stats['file_logger'] = self.file_logger.get_stats()
-            
+
         return stats
+
+    def get_stats_cached(self, ttl: float = 0.25) -> Dict:
+        """Get statistics, reusing a recent snapshot within ttl seconds"""
+        now = time.monotonic()
+        ts, val = self._stats_cache
+        if val is not None and now - ts < ttl:
+            return val
+        val = self.get_stats()
+        self._stats_cache = (now, val)
+        return val
+
+    def is_healthy(self) -> Dict:
+        """Connectivity flags only - no full stats dict needed"""
+        return {
+            'bed_connected': self.bed_reader.is_connected(),
+            'hand_connected': self.hand_reader.is_connected()
+        }
         
     def print_stats(self):
         """Print formatted statistics"""
         stats = self.get_stats()
-        
-        print("\n" + "=" * 60)
-        print("PIPELINE STATISTICS")
-        print("=" * 60)
-        
-        print(f"\nBed Reader:")
-        print(f"  Connected: {stats['bed_reader']['connected']}")
-        print(f"  Total reads: {stats['bed_reader']['total_reads']}")
-        print(f"  Errors: {stats['bed_reader']['error_count']}")
-        print(f"  Queue size: {stats['bed_reader']['queue_size']}")
-        
-        print(f"\nHand Reader:")
-        print(f"  Connected: {stats['hand_reader']['connected']}")
-        print(f"  Total reads: {stats['hand_reader']['total_reads']}")
-        print(f"  Errors: {stats['hand_reader']['error_count']}")
-        print(f"  Queue size: {stats['hand_reader']['queue_size']}")
-        
-        print(f"\nRadar Reader:")
-        print(f"  Connected: {stats['radar_reader']['connected']}")
-        print(f"  Total reads: {stats['radar_reader']['total_reads']}")
-        print(f"  Errors: {stats['radar_reader']['error_count']}")
-        print(f"  Queue size: {stats['radar_reader']['queue_size']}")
-        
-        print(f"\nDatabase:")
-        print(f"  Total stored: {stats['database']['total_stored']}")
-        print(f"  Bed points: {stats['database']['bed_points']}")
-        print(f"  Hand points: {stats['database']['hand_points']}")
-        print(f"  Radar points: {stats['database']['radar_points']}")
-        
+
+        report = STATS_TEMPLATE.format(
+            br=stats['bed_reader'],
+            hr=stats['hand_reader'],
+            rr=stats['radar_reader'],
+            db=stats['database']
+        )
         if 'file_logger' in stats:
-            print(f"\nFile Logger:")
-            print(f"  Total written: {stats['file_logger']['total_written']}")
-            print(f"  Current file: {stats['file_logger']['current_file']}")
-            
-        print("=" * 60 + "\n")
+            report += FILE_LOGGER_TEMPLATE.format(fl=stats['file_logger'])
+        sys.stdout.write(report + STATS_FOOTER)
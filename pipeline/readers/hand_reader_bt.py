@@ -1,7 +1,9 @@
+import os
+import selectors
 import serial
-import json
+import orjson
 import threading
-import queue
+from collections import deque
 import logging
 import time
 
@@ -11,7 +13,12 @@ class HandReaderBluetooth:
     def __init__(self, bt_port, poll_rate=20):
         self.bt_port = bt_port
         self.poll_rate = poll_rate
-        self.queue = queue.Queue(maxsize=1000)
+        # deque(maxlen) append is atomic and drops oldest on overflow;
+        # the Event lets consumers wait without a lock per operation
+        self.queue = deque(maxlen=1000)
+        self._wake = threading.Event()
+        # Set by stop() so error-path backoff waits end immediately
+        self._stop_evt = threading.Event()
         self.running = False
         self.thread = None
         self.ser = None
@@ -27,6 +34,15 @@ class HandReaderBluetooth:
         logger.info(f"Started reading from {self.bt_port}")
         
     def _read_loop(self):
+        # epoll (via DefaultSelector) on the serial fd: one wakeup per
+        # readiness event, then drain everything buffered - instead of
+        # readline() blocking one frame at a time
+        sel = selectors.DefaultSelector()
+        buf = b''
+        # Exponential backoff (0.1 s doubling, capped at 2 s) on error
+        # paths - reconnects retry quickly after a blip but don't spin,
+        # and _stop_evt cuts any wait short for prompt shutdown
+        backoff = 0
         while self.running:
             try:
                 if self.ser is None or not self.ser.is_open:
@@ -36,6 +52,8 @@ class HandReaderBluetooth:
                             baudrate=115200,
                             timeout=1
                         )
+                        sel.register(self.ser.fileno(), selectors.EVENT_READ)
+                        buf = b''
                         self.connected = True
                         logger.info(f"Connected to {self.bt_port}")
                     except Exception as e:
@@ -43,58 +61,102 @@ class HandReaderBluetooth:
                         self.error_count += 1
                         if self.error_count % 10 == 0:
                             logger.error(f"Failed to connect: {e}")
-                        time.sleep(2)
+                        if self._stop_evt.wait(min(2.0, 0.1 * 2 ** backoff)):
+                            return
+                        backoff += 1
                         continue
-                
-                line = self.ser.readline().decode('utf-8').strip()
-                
-                if line:
-                    try:
-                        data = json.loads(line)
-                        data['source'] = 'hand'
-                        data['received_at'] = time.time()
-                        data['read_number'] = self.total_reads
-                        
-                        try:
-                            self.queue.put_nowait(data)
-                        except queue.Full:
-                            try:
-                                self.queue.get_nowait()
-                                self.queue.put_nowait(data)
-                            except:
-                                pass
-                        
-                        self.total_reads += 1
-                        self.last_success = time.time()
-                        self.connected = True
-                        
-                        if self.total_reads % 100 == 0:
-                            logger.info(f"Read #{self.total_reads} successful")
-                    except json.JSONDecodeError:
-                        pass
-                        
-            except serial.SerialException as e:
+
+                if not sel.select(timeout=1):
+                    continue
+                chunk = os.read(self.ser.fileno(), 4096)
+                if not chunk:
+                    raise serial.SerialException("serial fd closed")
+                buf += chunk
+
+                # One clock read per drained burst - every line in it
+                # arrived together, so they share received_at
+                now = time.time()
+                while b'\n' in buf:
+                    line, _, buf = buf.partition(b'\n')
+                    line = line.strip(b'\r')
+                    # Byte-splice the pipeline fields into the raw wire
+                    # line instead of loads + mutate + dumps. Records
+                    # stay as JSON line bytes end to end; parsing is
+                    # deferred until a consumer actually needs fields
+                    # (the file logger never does)
+                    if not (line.startswith(b'{') and line.endswith(b'}')):
+                        continue
+                    # A bare {} frame has no field to splice after, so
+                    # the comma would produce invalid JSON
+                    fields = (
+                        '"source":"hand","received_at":%.6f,"read_number":%d}'
+                        % (now, self.total_reads)
+                    ).encode()
+                    if line == b'{}':
+                        raw = b'{' + fields
+                    else:
+                        raw = line[:-1] + b',' + fields
+
+                    self.queue.append(raw)
+                    self._wake.set()
+
+
+                    self.total_reads += 1
+                    self.last_success = now
+                    self.connected = True
+                    backoff = 0
+
+                    if self.total_reads % 100 == 0:
+                        logger.info(f"Read #{self.total_reads} successful")
+
+            except (serial.SerialException, OSError) as e:
                 self.connected = False
                 self.error_count += 1
                 if self.error_count % 10 == 0:
                     logger.error(f"Serial error: {e}")
                 if self.ser:
+                    try:
+                        sel.unregister(self.ser.fileno())
+                    except (KeyError, ValueError, OSError):
+                        pass
                     try:
                         self.ser.close()
                     except:
                         pass
                 self.ser = None
-                time.sleep(1)
+                if self._stop_evt.wait(min(2.0, 0.1 * 2 ** backoff)):
+                    return
+                backoff += 1
             except Exception as e:
                 self.error_count += 1
                 if self.error_count % 10 == 0:
                     logger.error(f"Error (count={self.error_count}): {e}")
-                time.sleep(0.1)
+                if self._stop_evt.wait(0.1):
+                    return
+        sel.close()
     
-    def get_data(self):
+    def get_data(self, timeout=None):
+        """Pop the oldest record as a dict (parsed on demand)"""
+        raw = self.get_raw(timeout=timeout)
+        if raw is None:
+            return None
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            self.error_count += 1
+            return None
+
+    def get_raw(self, timeout=None):
+        """
+        Pop the oldest record as augmented JSON line bytes - hand
+        these straight to FileLogger.log to skip the re-encode
+        """
+        if timeout is not None and not self.queue:
+            self._wake.wait(timeout=timeout)
+            self._wake.clear()
         try:
-            return self.queue.get_nowait()
-        except queue.Empty:
+            return self.queue.popleft()
+        except IndexError:
             return None
     
     def get_queue(self):
@@ -105,12 +167,13 @@ class HandReaderBluetooth:
             'connected': self.connected,
             'total_reads': self.total_reads,
             'error_count': self.error_count,
-            'queue_size': self.queue.qsize(),
+            'queue_size': len(self.queue),
             'last_success': self.last_success
         }
     
     def stop(self):
         self.running = False
+        self._stop_evt.set()
         if self.thread:
             self.thread.join(timeout=2)
         if self.ser and self.ser.is_open:
@@ -0,0 +1,175 @@
+import http.client
+import orjson
+import time
+import threading
+from collections import deque
+from queue import Queue
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger("HttpPollReader")
+
+class HttpPollReader:
+    """
+    Reads data from an ESP32 module over HTTP
+    Runs in background thread, puts data in queue
+
+    One parameterized class covers both the bed and hand modules -
+    they only ever differed in source tag, IP and poll rate.
+    """
+
+    def __init__(self, source: str, esp32_ip: str, poll_rate_hz: float = 10,
+                 sink: Optional[Queue] = None):
+        self.source = source
+        self.url = f"http://{esp32_ip}/data"
+        self.poll_interval = 1.0 / poll_rate_hz
+
+        # Optional shared pipeline queue - when set, data goes there as
+        # (source, data) so one consumer can block on a single queue
+        self.sink = sink
+
+        # Raw keep-alive connection - bypasses the requests abstraction
+        # layer (URL parsing, hooks, cookie jar) that costs real CPU at
+        # poll rate; recreated lazily after any connection error
+        self.host = esp32_ip
+        self.conn = None
+
+        # Bounded buffer - deque(maxlen) drops the oldest entry
+        # atomically on append, no lock juggling on overflow
+        self.data_queue = deque(maxlen=1000)
+        self._data_available = threading.Condition()
+
+        # Control
+        self.running = False
+        self.thread = None
+
+        # State
+        self.last_data = None
+        self.last_success_time = None
+        self.error_count = 0
+        self.total_reads = 0
+
+    def start(self):
+        """Start reading in background"""
+        if self.running:
+            logger.warning("Already running")
+            return
+
+        self.running = True
+        self.thread = threading.Thread(target=self._read_loop, daemon=True)
+        self.thread.start()
+        logger.info(f"[{self.source}] Started reading from {self.url}")
+
+    def stop(self):
+        """Stop reading"""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=3)
+        if self.conn:
+            self.conn.close()
+        logger.info(f"[{self.source}] Stopped")
+
+    def _fetch(self):
+        """One keep-alive GET /data; returns (status, body bytes)"""
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, timeout=2)
+        self.conn.request('GET', '/data')
+        response = self.conn.getresponse()
+        return response.status, response.read()
+
+    def _read_loop(self):
+        """Background thread - continuously reads"""
+        # Absolute next-tick schedule - per-poll latency jitter doesn't
+        # accumulate into rate drift like sleep(interval - elapsed) does
+        next_tick = time.monotonic()
+
+        while self.running:
+            try:
+                # Make HTTP request
+                status, body = self._fetch()
+
+                if status == 200:
+                    data = orjson.loads(body)
+
+                    # Add metadata - one clock read shared so
+                    # received_at and last_success_time can't skew
+                    now = time.time()
+                    data['source'] = self.source
+                    data['received_at'] = now
+                    data['read_number'] = self.total_reads
+
+                    # Store
+                    self.last_data = data
+                    self.last_success_time = now
+                    self.total_reads += 1
+                    self.error_count = 0  # Reset on success
+
+                    # Hand off - deque append drops oldest when full
+                    if self.sink is not None:
+                        self.sink.put((self.source, data))
+                    else:
+                        self.data_queue.append(data)
+                        with self._data_available:
+                            self._data_available.notify()
+
+                    # Log occasionally
+                    if self.total_reads % 100 == 0:
+                        logger.info(f"[{self.source}] Read #{self.total_reads} successful")
+
+                else:
+                    logger.warning(f"[{self.source}] HTTP {status}")
+                    self.error_count += 1
+
+            except Exception as e:
+                # Stale/broken socket - drop it so next poll reconnects
+                if self.conn:
+                    self.conn.close()
+                    self.conn = None
+                self.error_count += 1
+                if self.error_count % 10 == 0:
+                    logger.error(f"[{self.source}] Error (count={self.error_count}): {e}")
+
+            # Sleep to maintain poll rate
+            next_tick += self.poll_interval
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind (slow poll) - resync rather than burst
+                next_tick = time.monotonic()
+
+    def get_queue(self) -> deque:
+        """Get the data queue for consumption"""
+        return self.data_queue
+
+    def drain(self, timeout: float = 0.5) -> List[Dict]:
+        """
+        Take everything currently buffered, waiting up to timeout
+        for the first item. Returns [] on timeout.
+        """
+        with self._data_available:
+            if not self.data_queue:
+                self._data_available.wait(timeout=timeout)
+            batch = list(self.data_queue)
+            self.data_queue.clear()
+        return batch
+
+    def get_latest(self) -> Optional[Dict]:
+        """Get most recent data (or None)"""
+        return self.last_data
+
+    def is_connected(self) -> bool:
+        """Check if getting data successfully"""
+        if self.last_success_time is None:
+            return False
+        return (time.time() - self.last_success_time) < 5  # 5 sec timeout
+
+    def get_stats(self) -> Dict:
+        """Get reader statistics"""
+        return {
+            'total_reads': self.total_reads,
+            'error_count': self.error_count,
+            'connected': self.is_connected(),
+            'last_success': self.last_success_time,
+            'queue_size': len(self.data_queue)
+        }
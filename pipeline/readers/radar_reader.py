@@ -1,25 +1,50 @@
+import os
+import re
+import selectors
 import serial
 import time
 import threading
-from queue import Queue, Full
-from typing import Dict, Optional
+from collections import deque
+from queue import Queue
+from typing import Dict, List, Optional
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("RadarReader")
 
+# Compiled matcher for the DFRobot frame - one pass through re's
+# C engine validates the header and captures all five fields at once
+_JYBSS_RE = re.compile(rb'\$JYBSS,(\d+),(\d+),(\d+),(\d+),(\d+)\*')
+
+# Frame dict template - copy() skips per-frame key hashing
+_FRAME_TEMPLATE = {
+    'timestamp': 0.0,
+    'presence': False,
+    'movement': 0,
+    'heart_rate': 0,
+    'respiration_rate': 0,
+    'distance_cm': 0
+}
+
 class RadarReader:
     """
     Reads data from mmWave Radar over Serial (USB)
     """
     
-    def __init__(self, port: str, baudrate: int = 115200, poll_rate_hz: float = 10):
+    def __init__(self, port: str, baudrate: int = 115200, poll_rate_hz: float = 10,
+                 sink: Optional[Queue] = None):
         self.port = port
         self.baudrate = baudrate
         self.poll_interval = 1.0 / poll_rate_hz
+
+        # Optional shared pipeline queue - when set, data goes there as
+        # ('radar', data) so one consumer can block on a single queue
+        self.sink = sink
         
         self.ser = None
-        self.data_queue = Queue(maxsize=1000)
+        # Bounded buffer - deque(maxlen) drops the oldest entry
+        # atomically on append, no lock juggling on overflow
+        self.data_queue = deque(maxlen=1000)
+        self._data_available = threading.Condition()
         
         self.running = False
         self.thread = None
@@ -56,31 +81,46 @@ class RadarReader:
         logger.info("Stopped")
         
     def _read_loop(self):
+        # epoll (via DefaultSelector) on the serial fd: sleep until
+        # bytes arrive and drain them all, instead of polling
+        # in_waiting every 10 ms
+        sel = selectors.DefaultSelector()
+        sel.register(self.ser.fileno(), selectors.EVENT_READ)
+        buf = b''
         while self.running:
             try:
-                if self.ser and self.ser.in_waiting > 0:
-                    line = self.ser.readline()
-                    data = self._parse_line(line)
-                    
+                if not sel.select(timeout=1):
+                    continue
+                chunk = os.read(self.ser.fileno(), 4096)
+                if not chunk:
+                    continue
+                buf += chunk
+
+                # One clock read per drained burst, shared by every
+                # frame in it (timestamp, received_at, last_success)
+                now = time.time()
+                while b'\n' in buf:
+                    line, _, buf = buf.partition(b'\n')
+                    data = self._parse_line(line, now)
+
                     if data:
                         data['source'] = 'radar'
-                        data['received_at'] = time.time()
+                        data['received_at'] = now
                         data['read_number'] = self.total_reads
-                        
+
                         self.last_data = data
-                        self.last_success_time = time.time()
+                        self.last_success_time = now
                         self.total_reads += 1
                         self.error_count = 0
                         
-                        try:
-                            self.data_queue.put_nowait(data)
-                        except Full:
-                            try:
-                                self.data_queue.get_nowait()
-                                self.data_queue.put_nowait(data)
-                            except:
-                                pass
-                                
+                        if self.sink is not None:
+                            self.sink.put(('radar', data))
+                        else:
+                            self.data_queue.append(data)
+                            with self._data_available:
+                                self._data_available.notify()
+
+
                         if self.total_reads % 100 == 0:
                             logger.info(f"Read #{self.total_reads} successful")
                             
@@ -88,36 +128,44 @@ class RadarReader:
                 self.error_count += 1
                 if self.error_count % 10 == 0:
                     logger.error(f"Error (count={self.error_count}): {e}")
-                    
-            time.sleep(0.01)
-            
-    def _parse_line(self, line: bytes) -> Optional[Dict]:
+                time.sleep(0.1)
+        sel.close()
+
+    def _parse_line(self, line: bytes, now: Optional[float] = None) -> Optional[Dict]:
         """Parse DFRobot mmWave radar format"""
-        try:
-            decoded = line.decode('utf-8').strip()
-            
-            # Format: $JYBSS,presence,movement,hr,rr,distance*checksum
-            if decoded.startswith('$JYBSS'):
-                parts = decoded.split(',')
-                
-                if len(parts) >= 6:
-                    return {
-                        'timestamp': time.time(),
-                        'presence': bool(int(parts[1])),
-                        'movement': int(parts[2]),
-                        'heart_rate': int(parts[3]),
-                        'respiration_rate': int(parts[4]),
-                        'distance_cm': int(parts[5].split('*')[0])
-                    }
-                    
-        except Exception as e:
-            pass
-            
-        return None
+        # Format: $JYBSS,presence,movement,hr,rr,distance*checksum
+        # The compiled regex validates and captures in one C-level
+        # pass; int() on the bytes groups skips any str allocation
+        m = _JYBSS_RE.match(line)
+        if m is None:
+            return None
+
+        presence, movement, hr, rr, distance = map(int, m.groups())
+        data = _FRAME_TEMPLATE.copy()
+        data['timestamp'] = now if now is not None else time.time()
+        data['presence'] = bool(presence)
+        data['movement'] = movement
+        data['heart_rate'] = hr
+        data['respiration_rate'] = rr
+        data['distance_cm'] = distance
+        return data
         
-    def get_queue(self) -> Queue:
+    def get_queue(self) -> deque:
         return self.data_queue
-        
+
+    def drain(self, timeout: float = 0.5) -> List[Dict]:
+        """
+        Take everything currently buffered, waiting up to timeout
+        for the first item. Returns [] on timeout.
+        """
+        with self._data_available:
+            if not self.data_queue:
+                self._data_available.wait(timeout=timeout)
+            batch = list(self.data_queue)
+            self.data_queue.clear()
+        return batch
+
+
     def get_latest(self) -> Optional[Dict]:
         return self.last_data
         
@@ -132,5 +180,5 @@ class RadarReader:
             'error_count': self.error_count,
             'connected': self.is_connected(),
             'last_success': self.last_success_time,
-            'queue_size': self.data_queue.qsize()
+            'queue_size': len(self.data_queue)
         }
@@ -1,18 +1,11 @@
-import json
+import orjson
 import os
+from collections import deque
 from datetime import datetime
 import threading
-from queue import Queue, Empty
 import logging
-import json
-import os
-from datetime import datetime
-import threading
-from queue import Queue, Empty
-import logging
-from typing import Dict  # ← ADD THIS LINE
+from typing import Dict
 
-logger = logging.getLogger("FileLogger")
 logger = logging.getLogger("FileLogger")
 
 class FileLogger:
@@ -21,105 +14,145 @@ class FileLogger:
     Runs in background thread
     Creates new file each hour
     """
-    
+
     def __init__(self, log_dir: str = "./data_logs"):
         self.log_dir = log_dir
-        
+
         # Create directory if doesn't exist
         os.makedirs(log_dir, exist_ok=True)
-        
-        # Queue for async writing
-        self.write_queue = Queue(maxsize=10000)
-        
+
+        # Buffer for async writing - deque append is atomic under the
+        # GIL and drop-oldest on overflow; the Event wakes the writer
+        self.write_queue = deque(maxlen=10000)
+        self._wake = threading.Event()
+
         # Control
         self.running = False
         self.thread = None
-        
-        # Current file
-        self.current_file = None
+
+        # Current file (raw fd, opened O_APPEND so writes are atomic)
+        self.fd = None
         self.current_hour = None
-        
+
         # Stats
         self.total_written = 0
-        
+
     def start(self):
         """Start logging to files"""
         if self.running:
             logger.warning("Already running")
             return
-            
+
         self.running = True
         self.thread = threading.Thread(target=self._write_loop, daemon=True)
         self.thread.start()
         logger.info(f"Started file logger (dir: {self.log_dir})")
-        
+
     def stop(self):
         """Stop logging"""
         self.running = False
         if self.thread:
             self.thread.join(timeout=3)
-        if self.current_file:
-            self.current_file.close()
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
         logger.info("Stopped")
-        
-    def log(self, data: Dict):
+
+    def log(self, data):
         """
         Log data (non-blocking)
         Call this from main thread
+
+        Accepts a dict, or pre-encoded JSON line bytes from readers
+        that carry the raw wire payload through - those skip the
+        serialize step entirely
         """
-        try:
-            self.write_queue.put_nowait(data)
-        except:
+        self.write_queue.append(data)
+        self._wake.set()
+
+    def log_many(self, batch):
+        """Log a whole drained batch (non-blocking)"""
+        self.write_queue.extend(batch)
+        self._wake.set()
+
+    def _drain(self, limit: int = 256):
+        """Pop up to limit buffered records"""
+        batch = []
+        while len(batch) < limit:
             try:
-                self.write_queue.get_nowait()
-                self.write_queue.put_nowait(data)
-            except:
-                pass
-                
+                batch.append(self.write_queue.popleft())
+            except IndexError:
+                break
+        return batch
+
     def _write_loop(self):
-        """Background thread - writes to files"""
+        """Background thread - batches records into one write syscall"""
         while self.running:
             try:
-                try:
-                    data = self.write_queue.get(timeout=1)
-                except Empty:
+                if not self._wake.wait(timeout=1):
                     continue
-                    
-                # Check if we need new file (new hour)
-                current_hour = datetime.now().strftime("%Y-%m-%d_%H")
-                if current_hour != self.current_hour:
-                    self._open_new_file(current_hour)
-                    
-                # Write to file
-                if self.current_file:
-                    json_line = json.dumps(data)
-                    self.current_file.write(json_line + '\n')
-                    self.current_file.flush()
-                    self.total_written += 1
-                    
-                    if self.total_written % 1000 == 0:
-                        logger.info(f"Logged {self.total_written} data points")
-                        
+                self._wake.clear()
+
+                # Drain whatever arrived so the whole batch goes out in
+                # one syscall instead of one per record
+                batch = self._drain()
+                if batch:
+                    self._write_batch(batch)
+
             except Exception as e:
                 logger.error(f"Write error: {e}")
-                
+
+        # Flush whatever is still queued so a clean stop loses nothing
+        remainder = self._drain(limit=len(self.write_queue) + 1)
+        if remainder:
+            try:
+                self._write_batch(remainder)
+            except Exception as e:
+                logger.error(f"Final flush error: {e}")
+
+    def _write_batch(self, batch):
+        """Serialize a batch and append it in one syscall"""
+        # Check if we need new file (new hour)
+        current_hour = datetime.now().strftime("%Y-%m-%d_%H")
+        if current_hour != self.current_hour:
+            self._open_new_file(current_hour)
+
+        if self.fd is not None:
+            # Vectored write - the kernel gathers the per-record buffers
+            # itself, so no intermediate join copy is allocated
+            buffers = []
+            for d in batch:
+                buffers.append(d if isinstance(d, bytes) else orjson.dumps(d))
+                buffers.append(b'\n')
+            os.writev(self.fd, buffers)
+            self.total_written += len(batch)
+
+            if self.total_written % 1000 < len(batch):
+                logger.info(f"Logged {self.total_written} data points")
+
     def _open_new_file(self, hour_str: str):
         """Open new file for this hour"""
-        if self.current_file:
-            self.current_file.close()
-            
+        if self.fd is not None:
+            # Only durability point - data is flushed to media once per
+            # rollover rather than per record
+            try:
+                os.fsync(self.fd)
+            except OSError:
+                pass
+            os.close(self.fd)
+
         filename = f"data_{hour_str}.jsonl"
         filepath = os.path.join(self.log_dir, filename)
-        
-        self.current_file = open(filepath, 'a')
+
+        self.fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
         self.current_hour = hour_str
-        
+
         logger.info(f"Opened new log file: {filepath}")
-        
+
     def get_stats(self) -> Dict:
         """Get logger statistics"""
         return {
             'total_written': self.total_written,
-            'queue_size': self.write_queue.qsize(),
+            'queue_size': len(self.write_queue),
             'current_file': self.current_hour
         }
@@ -1,102 +1,225 @@
 import time
-from collections import deque
+import numpy as np
 from typing import Dict, List, Optional
 import threading
 import logging
 
 logger = logging.getLogger("TimeSeriesDB")
 
+# Numeric radar fields stored column-wise (SoA) - the radar frame
+# schema is fixed by RadarReader._parse_line, so these can live in
+# compact typed arrays next to the dict payloads.
+#
+# Dtypes are sized to the sensor's physical ranges so a 10k-point
+# buffer stays small enough for the Pi's L2; inserts clamp to the
+# stated cap so out-of-range readings wrap to the cap, not to garbage.
+#   heart_rate        0-220 bpm        -> uint8  (cap 255)
+#   respiration_rate  0-60 breaths/min -> uint8  (cap 255)
+#   distance_cm       0-800 cm         -> uint16 (cap 65535)
+#   movement          0-255 energy     -> uint8  (cap 255)
+#   presence          0-3 state        -> uint8  (cap 255)
+RADAR_COLUMNS = (
+    ('heart_rate', np.uint8, 255),
+    ('respiration_rate', np.uint8, 255),
+    ('distance_cm', np.uint16, 65535),
+    ('movement', np.uint8, 255),
+    ('presence', np.uint8, 255),
+)
+
+class SourceRing:
+    """
+    Fixed-size ring buffer for one sensor source.
+
+    Payload dicts live in a preallocated slot list and timestamps live
+    in a parallel float64 column, so insert is an indexed assignment
+    and time-window queries are a searchsorted over the column instead
+    of a scan over every stored dict.
+    """
+
+    def __init__(self, max_points: int):
+        self.max_points = max_points
+        self.timestamps = np.zeros(max_points, dtype=np.float64)
+        self.payloads = [None] * max_points
+        self.head = 0  # Total inserts ever; head % max_points is the next slot
+
+    def append(self, data: Dict):
+        slot = self.head % self.max_points
+        self.timestamps[slot] = data.get('received_at', 0)
+        self.payloads[slot] = data
+        self.head += 1
+
+    def __len__(self):
+        return min(self.head, self.max_points)
+
+    def latest(self) -> Optional[Dict]:
+        if self.head == 0:
+            return None
+        return self.payloads[(self.head - 1) % self.max_points]
+
+    def since(self, cutoff: float) -> List[Dict]:
+        """
+        All payloads with received_at > cutoff, oldest first.
+
+        Bisects the timestamp column per ring segment so only the
+        returned window is ever copied - no full-buffer rebuild.
+        """
+        if self.head <= self.max_points:
+            n = len(self)
+            idx = int(np.searchsorted(self.timestamps[:n], cutoff, side='right'))
+            return self.payloads[idx:n]
+
+        # Wrapped: [split:] holds the older half, [:split] the newer
+        split = self.head % self.max_points
+        old_ts = self.timestamps[split:]
+        idx = int(np.searchsorted(old_ts, cutoff, side='right'))
+        if idx < len(old_ts):
+            return self.payloads[split + idx:] + self.payloads[:split]
+        idx = int(np.searchsorted(self.timestamps[:split], cutoff, side='right'))
+        return self.payloads[idx:split]
+
 class TimeSeriesDB:
     """
     In-memory time-series database
     Stores all sensor data with timestamps
     Thread-safe
     """
-    
+
     def __init__(self, max_points: int = 10000):
         self.max_points = max_points
-        
-        # Separate deques for each source
-        self.bed_data = deque(maxlen=max_points)
-        self.hand_data = deque(maxlen=max_points)
-        self.radar_data = deque(maxlen=max_points)
-        
+
+        # Ring buffer per source
+        self.bed_data = SourceRing(max_points)
+        self.hand_data = SourceRing(max_points)
+        self.radar_data = SourceRing(max_points)
+
+        # Column store for radar numerics, aligned slot-for-slot with
+        # the radar ring so analytics get contiguous typed vectors
+        self.radar_cols = {
+            name: np.zeros(max_points, dtype=dtype)
+            for name, dtype, _ in RADAR_COLUMNS
+        }
+
         # Lock for thread safety
         self.lock = threading.Lock()
-        
+
         # Stats
         self.total_stored = 0
-        
+
     def insert_bed(self, data: Dict):
         """Store bed module data"""
         with self.lock:
             self.bed_data.append(data)
             self.total_stored += 1
-            
+
     def insert_hand(self, data: Dict):
         """Store hand module data"""
         with self.lock:
             self.hand_data.append(data)
             self.total_stored += 1
-            
+
     def insert_radar(self, data: Dict):
         """Store radar data"""
         with self.lock:
-            self.radar_data.append(data)
+            self._radar_insert(data)
             self.total_stored += 1
-            
+
+    def _radar_insert(self, data: Dict):
+        """Write one radar sample into the ring and its columns"""
+        slot = self.radar_data.head % self.max_points
+        for name, _, cap in RADAR_COLUMNS:
+            value = data.get(name, 0)
+            if value < 0:
+                value = 0
+            elif value > cap:
+                value = cap
+            self.radar_cols[name][slot] = value
+        self.radar_data.append(data)
+
+    def get_radar_window(self, seconds: float = 60) -> Dict:
+        """
+        Radar numerics from the last N seconds as typed numpy arrays,
+        oldest first - for vectorized analysis without dict iteration
+        """
+        cutoff = time.time() - seconds
+        with self.lock:
+            ring = self.radar_data
+            n = len(ring)
+            # Slot indices in insert order, oldest first
+            order = np.arange(ring.head - n, ring.head) % self.max_points
+            ts = ring.timestamps[order]
+            start = int(np.searchsorted(ts, cutoff, side='right'))
+            sel = order[start:]
+            window = {'received_at': ts[start:]}
+            # Widened to float32 on the way out so consumers can do
+            # arithmetic without tripping uint8/uint16 wraparound
+            for name, _, _ in RADAR_COLUMNS:
+                window[name] = self.radar_cols[name][sel].astype(np.float32)
+            return window
+
+    def insert_bed_many(self, batch: List[Dict]):
+        """Store a batch of bed data under one lock acquire"""
+        with self.lock:
+            for data in batch:
+                self.bed_data.append(data)
+            self.total_stored += len(batch)
+
+    def insert_hand_many(self, batch: List[Dict]):
+        """Store a batch of hand data under one lock acquire"""
+        with self.lock:
+            for data in batch:
+                self.hand_data.append(data)
+            self.total_stored += len(batch)
+
+    def insert_radar_many(self, batch: List[Dict]):
+        """Store a batch of radar data under one lock acquire"""
+        with self.lock:
+            for data in batch:
+                self._radar_insert(data)
+            self.total_stored += len(batch)
+
     def get_latest_bed(self) -> Optional[Dict]:
         """Get most recent bed data"""
         with self.lock:
-            return self.bed_data[-1] if self.bed_data else None
-            
+            return self.bed_data.latest()
+
     def get_latest_hand(self) -> Optional[Dict]:
         """Get most recent hand data"""
         with self.lock:
-            return self.hand_data[-1] if self.hand_data else None
-            
+            return self.hand_data.latest()
+
     def get_latest_radar(self) -> Optional[Dict]:
         """Get most recent radar data"""
         with self.lock:
-            return self.radar_data[-1] if self.radar_data else None
-            
+            return self.radar_data.latest()
+
     def get_bed_history(self, seconds: float = 60) -> List[Dict]:
         """Get bed data from last N seconds"""
         cutoff = time.time() - seconds
         with self.lock:
-            return [
-                d for d in self.bed_data 
-                if d.get('received_at', 0) > cutoff
-            ]
-            
+            return self.bed_data.since(cutoff)
+
     def get_hand_history(self, seconds: float = 60) -> List[Dict]:
         """Get hand data from last N seconds"""
         cutoff = time.time() - seconds
         with self.lock:
-            return [
-                d for d in self.hand_data 
-                if d.get('received_at', 0) > cutoff
-            ]
-            
+            return self.hand_data.since(cutoff)
+
     def get_radar_history(self, seconds: float = 60) -> List[Dict]:
         """Get radar data from last N seconds"""
         cutoff = time.time() - seconds
         with self.lock:
-            return [
-                d for d in self.radar_data 
-                if d.get('received_at', 0) > cutoff
-            ]
-            
+            return self.radar_data.since(cutoff)
+
     def get_all_latest(self) -> Dict:
         """Get latest from all sources"""
         with self.lock:
             return {
-                'bed': self.bed_data[-1] if self.bed_data else None,
-                'hand': self.hand_data[-1] if self.hand_data else None,
-                'radar': self.radar_data[-1] if self.radar_data else None,
+                'bed': self.bed_data.latest(),
+                'hand': self.hand_data.latest(),
+                'radar': self.radar_data.latest(),
                 'timestamp': time.time()
             }
-            
+
     def get_stats(self) -> Dict:
         """Get database statistics"""
         with self.lock:
@@ -107,11 +230,13 @@ class TimeSeriesDB:
                 'radar_points': len(self.radar_data),
                 'max_points': self.max_points
             }
-            
+
     def clear(self):
         """Clear all data"""
         with self.lock:
-            self.bed_data.clear()
-            self.hand_data.clear()
-            self.radar_data.clear()
+            self.bed_data = SourceRing(self.max_points)
+            self.hand_data = SourceRing(self.max_points)
+            self.radar_data = SourceRing(self.max_points)
+            for col in self.radar_cols.values():
+                col.fill(0)
             logger.info("Database cleared")
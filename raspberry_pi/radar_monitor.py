@@ -4,15 +4,21 @@ Guardian Bed - LD2410C Radar Monitor
 Reads radar data and sends to API server
 """
 import serial
+import struct
 import time
 import requests
-import struct
+from requests.adapters import HTTPAdapter
 
 # Configuration
 SERIAL_PORT = '/dev/ttyAMA0'
 BAUD_RATE = 115200
 API_ENDPOINT = "http://172.30.202.252:8000/api/radar"
 
+# Pooled session - reuses one TCP connection to the API server instead
+# of a new handshake per send
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
 print("="*60)
 print("GUARDIAN BED - RADAR MONITOR")
 print("="*60)
@@ -24,7 +30,9 @@ print()
 
 # Open serial connection
 try:
-    radar = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
+    # Blocking reads - the OS wakes us when a frame arrives instead of
+    # sleep-polling in_waiting at 10 Hz
+    radar = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=None)
     print("✓ Radar connected")
 except Exception as e:
     print(f"✗ Failed to connect to radar: {e}")
@@ -38,16 +46,13 @@ time.sleep(0.5)
 print("Starting radar monitoring...")
 print()
 
-def parse_radar_frame(data):
-    """Parse LD2410C data frame"""
+# LD2410C frame layout, precompiled - unpack_from reads the three
+# bytes of interest in one C call straight off the bytearray
+_LD2410 = struct.Struct('<6sBxxBxxB')
+
+def parse_radar_frame(target_state, moving_distance, stationary_distance):
+    """Parse one LD2410C data frame (fields from _LD2410.unpack_from)"""
     try:
-        if len(data) < 13:
-            return None
-        
-        target_state = data[6] if len(data) > 6 else 0
-        moving_distance = data[9] if len(data) > 9 else 0
-        stationary_distance = data[12] if len(data) > 12 else 0
-        
         presence = 0
         distance_cm = 0
         
@@ -76,41 +81,47 @@ SEND_INTERVAL = 1
 
 while True:
     try:
-        if radar.in_waiting > 0:
-            chunk = radar.read(radar.in_waiting)
-            packet_buffer.extend(chunk)
-            
-            if len(packet_buffer) >= 13:
-                parsed = parse_radar_frame(packet_buffer)
-                
-                if parsed and time.time() - last_send_time >= SEND_INTERVAL:
-                    parsed['timestamp'] = time.time()
-                    
-                    status = "No presence"
-                    if parsed['presence'] == 1:
-                        status = f"Moving target at {parsed['distance_cm']}cm"
-                    elif parsed['presence'] == 2:
-                        status = f"Stationary target at {parsed['distance_cm']}cm"
-                    elif parsed['presence'] == 3:
-                        status = f"Both targets at {parsed['distance_cm']}cm"
-                    
-                    print(f"[{time.strftime('%H:%M:%S')}] {status}")
-                    
-                    try:
-                        response = requests.post(API_ENDPOINT, json=parsed, timeout=2)
-                        if response.status_code == 200:
-                            print("  ✓ Sent to API")
-                        else:
-                            print(f"  ✗ API error: {response.status_code}")
-                    except requests.exceptions.RequestException as e:
-                        print(f"  ✗ API send failed: {e}")
-                    
-                    last_send_time = time.time()
-                
-                packet_buffer = packet_buffer[-50:]
-        
-        time.sleep(0.1)
-        
+        # Block until a full frame's worth of bytes arrives, then grab
+        # anything else already buffered
+        chunk = radar.read(_LD2410.size)
+        packet_buffer.extend(chunk)
+        waiting = radar.in_waiting
+        if waiting:
+            packet_buffer.extend(radar.read(waiting))
+
+        # Consume complete frames in place - del from the front
+        # instead of reallocating the buffer with a tail slice
+        parsed = None
+        while len(packet_buffer) >= _LD2410.size:
+            _, state, moving, stationary = _LD2410.unpack_from(packet_buffer)
+            parsed = parse_radar_frame(state, moving, stationary) or parsed
+            del packet_buffer[:_LD2410.size]
+
+        if parsed and time.time() - last_send_time >= SEND_INTERVAL:
+            parsed['timestamp'] = time.time()
+
+            status = "No presence"
+            if parsed['presence'] == 1:
+                status = f"Moving target at {parsed['distance_cm']}cm"
+            elif parsed['presence'] == 2:
+                status = f"Stationary target at {parsed['distance_cm']}cm"
+            elif parsed['presence'] == 3:
+                status = f"Both targets at {parsed['distance_cm']}cm"
+
+            print(f"[{time.strftime('%H:%M:%S')}] {status}")
+
+            try:
+                response = SESSION.post(API_ENDPOINT, json=parsed, timeout=2)
+                if response.status_code == 200:
+                    print("  ✓ Sent to API")
+                else:
+                    print(f"  ✗ API error: {response.status_code}")
+            except requests.exceptions.RequestException as e:
+                print(f"  ✗ API send failed: {e}")
+
+            last_send_time = time.time()
+
+
     except KeyboardInterrupt:
         print("\n\nStopping radar monitor...")
         break
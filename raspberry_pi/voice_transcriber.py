@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
+import io
 import os
 import time
 import subprocess
+import threading
+import queue
+import wave
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
 from openai import OpenAI
 
 # Configuration
@@ -10,32 +16,61 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "sk-proj-1i35imkXb8oluAU4yfe1W5xMz3
 API_ENDPOINT = "http://172.30.202.252:8000/api/transcript"
 AUDIO_DEVICE = "plughw:2,0"
 CHUNK_DURATION = 5
+SAMPLE_RATE = 16000
+CHUNK_BYTES = SAMPLE_RATE * 2 * CHUNK_DURATION  # s16le mono
+
+# Local Whisper (CTranslate2 int8) removes the per-chunk upload RTT and
+# API cost entirely; fall back to the OpenAI API when the package or
+# model isn't available on this device
+try:
+    from faster_whisper import WhisperModel
+    local_model = WhisperModel("tiny.en", device="cpu", compute_type="int8")
+    print("✓ Using local faster-whisper model")
+except Exception:
+    local_model = None
 
 client = OpenAI(api_key=OPENAI_API_KEY)
 
-def record_audio(filename, duration=5):
-    cmd = [
-        'arecord',
-        '-D', AUDIO_DEVICE,
-        '-f', 'cd',
-        '-d', str(duration),
-        filename
-    ]
-    try:
-        subprocess.run(cmd, check=True, capture_output=True)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Recording failed: {e}")
-        return False
+# Pooled session - reuses one TCP connection to the API server instead
+# of a new handshake per send
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
 
-def transcribe_audio(filename):
+def start_arecord():
+    """One long-running capture producing raw s16le on stdout"""
+    return subprocess.Popen(
+        ['arecord', '-D', AUDIO_DEVICE, '-f', 'S16_LE',
+         '-r', str(SAMPLE_RATE), '-c', '1', '-t', 'raw'],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=0
+    )
+
+def pcm_to_wav(pcm):
+    """Wrap raw PCM in an in-memory WAV for the upload path"""
+    bio = io.BytesIO()
+    with wave.open(bio, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(pcm)
+    bio.seek(0)
+    bio.name = 'chunk.wav'  # the OpenAI SDK wants a filename hint
+    return bio
+
+def transcribe_audio(pcm):
     try:
-        with open(filename, 'rb') as audio_file:
-            transcript = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                language="en"
+        if local_model is not None:
+            # faster-whisper accepts float32 samples directly
+            audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+            segments, _ = local_model.transcribe(
+                audio, beam_size=1, vad_filter=True
             )
+            return ' '.join(s.text.strip() for s in segments)
+
+        transcript = client.audio.transcriptions.create(
+            model="whisper-1",
+            file=pcm_to_wav(pcm),
+            language="en"
+        )
         return transcript.text
     except Exception as e:
         print(f"Transcription failed: {e}")
@@ -48,12 +83,74 @@ def send_to_api(text):
             'timestamp': time.time(),
             'source': 'voice'
         }
-        response = requests.post(API_ENDPOINT, json=data, timeout=5)
+        response = SESSION.post(API_ENDPOINT, json=data, timeout=5)
         return response.status_code == 200
     except Exception as e:
         print(f"API send failed: {e}")
         return False
 
+def recorder_loop(rec_q, stop):
+    """Stage 1: stream raw PCM from one arecord pipe, no temp files"""
+    proc = start_arecord()
+    buf = bytearray(CHUNK_BYTES)
+    mv = memoryview(buf)
+    count = 0
+
+    while not stop.is_set():
+        filled = 0
+        while filled < CHUNK_BYTES and not stop.is_set():
+            n = proc.stdout.readinto(mv[filled:])
+            if not n:
+                # arecord died - restart the capture
+                print("  ✗ Recording stream ended, restarting...")
+                proc.kill()
+                time.sleep(1)
+                proc = start_arecord()
+                filled = 0
+                continue
+            filled += n
+
+        if filled < CHUNK_BYTES:
+            break  # stopping mid-chunk
+
+        count += 1
+        print(f"[{count}] Captured {CHUNK_DURATION} seconds")
+        try:
+            rec_q.put(bytes(buf), timeout=1)
+        except queue.Full:
+            print("  ✗ Transcriber backed up, dropping chunk")
+
+    proc.kill()
+
+def transcriber_loop(rec_q, post_q, stop):
+    """Stage 2: transcribe captured chunks"""
+    while not stop.is_set():
+        try:
+            pcm = rec_q.get(timeout=1)
+        except queue.Empty:
+            continue
+
+        text = transcribe_audio(pcm)
+
+        if text:
+            print(f"  ✓ Transcript: \"{text}\"")
+            post_q.put(text)
+        else:
+            print("  ✗ Transcription failed")
+
+def sender_loop(post_q, stop):
+    """Stage 3: post transcripts to the API"""
+    while not stop.is_set():
+        try:
+            text = post_q.get(timeout=1)
+        except queue.Empty:
+            continue
+
+        if send_to_api(text):
+            print("  ✓ Sent to API")
+        else:
+            print("  ✗ API send failed")
+
 def main():
     print("="*60)
     print("GUARDIAN BED - VOICE TRANSCRIPTION")
@@ -64,43 +161,30 @@ def main():
     print("="*60)
     print("\nStarting continuous transcription...")
     print("Press Ctrl+C to stop\n")
-    
-    audio_file = "/tmp/audio_chunk.wav"
-    count = 0
-    
+
+    # Three pipelined stages - recording the next chunk overlaps with
+    # transcribing and posting the previous ones, so cycle time is the
+    # slowest stage instead of the sum of all three
+    rec_q = queue.Queue(maxsize=2)
+    post_q = queue.Queue(maxsize=10)
+    stop = threading.Event()
+
+    stages = [
+        threading.Thread(target=recorder_loop, args=(rec_q, stop), daemon=True),
+        threading.Thread(target=transcriber_loop, args=(rec_q, post_q, stop), daemon=True),
+        threading.Thread(target=sender_loop, args=(post_q, stop), daemon=True),
+    ]
+    for t in stages:
+        t.start()
+
     try:
         while True:
-            count += 1
-            print(f"[{count}] Recording {CHUNK_DURATION} seconds...")
-            
-            if not record_audio(audio_file, CHUNK_DURATION):
-                print("  ✗ Recording failed, retrying...")
-                time.sleep(1)
-                continue
-            
-            print(f"  ✓ Recorded. Transcribing...")
-            
-            text = transcribe_audio(audio_file)
-            
-            if text:
-                print(f"  ✓ Transcript: \"{text}\"")
-                
-                if send_to_api(text):
-                    print(f"  ✓ Sent to API")
-                else:
-                    print(f"  ✗ API send failed")
-            else:
-                print(f"  ✗ Transcription failed")
-            
-            print()
-            
-            if os.path.exists(audio_file):
-                os.remove(audio_file)
-                
+            time.sleep(1)
     except KeyboardInterrupt:
         print("\n\nStopping transcription...")
-        if os.path.exists(audio_file):
-            os.remove(audio_file)
+        stop.set()
+        for t in stages:
+            t.join(timeout=2)
         print("Done!")
 
 if __name__ == "__main__":
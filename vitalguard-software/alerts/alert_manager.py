@@ -6,8 +6,15 @@ risk level changes, cooldown periods, and escalation rules.
 """
 
 import time
+from collections import defaultdict, deque
+from itertools import islice
 from config.settings import ALERT_LEVELS, EMAIL_COOLDOWN_SEC
 
+# Severity ranking - module constant so evaluate() doesn't rebuild the
+# dict on every call (it runs per patient per poll)
+_LEVEL_ORDER = {"info": 0, "caution": 1, "warning": 2, "critical": 3}
+_WARNING = _LEVEL_ORDER["warning"]
+
 
 class AlertManager:
     """
@@ -25,7 +32,10 @@ class AlertManager:
         self.notifiers = notifiers or []
         self.last_alert_time = {}  # patient_id -> timestamp
         self.last_alert_level = {}  # patient_id -> level
-        self.alert_log = []  # all dispatched alerts
+        # Bounded history (oldest dropped) plus a per-patient index so
+        # filtered lookups don't scan the whole log
+        self.alert_log = deque(maxlen=10000)
+        self._by_patient = defaultdict(lambda: deque(maxlen=1000))
 
     def evaluate(self, assessment: dict) -> dict:
         """
@@ -52,9 +62,8 @@ class AlertManager:
         last_time = self.last_alert_time.get(pid, 0)
         elapsed = now - last_time
 
-        level_order = {"info": 0, "caution": 1, "warning": 2, "critical": 3}
-        current_severity = level_order.get(risk_level, 0)
-        prev_severity = level_order.get(prev_level, 0)
+        current_severity = _LEVEL_ORDER.get(risk_level, 0)
+        prev_severity = _LEVEL_ORDER.get(prev_level, 0)
 
         should_alert = False
         reason = ""
@@ -65,7 +74,7 @@ class AlertManager:
             reason = f"Escalated to CRITICAL (score: {risk_score:.0f})"
 
         # Rule 2: Alert on escalation to warning
-        elif risk_level == "warning" and prev_severity < level_order["warning"]:
+        elif risk_level == "warning" and prev_severity < _WARNING:
             should_alert = True
             reason = f"Escalated to WARNING (score: {risk_score:.0f})"
 
@@ -75,7 +84,7 @@ class AlertManager:
             reason = f"Sustained CRITICAL — re-alert (score: {risk_score:.0f})"
 
         # Rule 4: Escalation always overrides cooldown
-        elif current_severity > prev_severity and current_severity >= 2:
+        elif current_severity > prev_severity and current_severity >= _WARNING:
             should_alert = True
             reason = f"Risk escalated: {prev_level} -> {risk_level}"
 
@@ -94,10 +103,13 @@ class AlertManager:
                 "sub_scores": assessment.get("sub_scores", {}),
             }
 
-            # Dispatch to all notifiers
+            # Dispatch to all notifiers - prefer a notifier's
+            # non-blocking path so SMTP latency stays off the
+            # assessment loop
             for notifier in self.notifiers:
                 try:
-                    result = notifier.send(alert_payload)
+                    send = getattr(notifier, "send_async", None) or notifier.send
+                    result = send(alert_payload)
                     alerts_sent.append({
                         "notifier": notifier.__class__.__name__,
                         "success": result.get("success", False),
@@ -114,6 +126,7 @@ class AlertManager:
             self.last_alert_time[pid] = now
             self.last_alert_level[pid] = risk_level
             self.alert_log.append(alert_payload)
+            self._by_patient[pid].append(alert_payload)
         else:
             self.last_alert_level[pid] = risk_level
 
@@ -129,5 +142,12 @@ class AlertManager:
     def get_alert_history(self, patient_id: str = None) -> list:
         """Get alert history, optionally filtered by patient."""
         if patient_id:
-            return [a for a in self.alert_log if a["patient_id"] == patient_id]
-        return self.alert_log
\ No newline at end of file
+            return list(self._by_patient[patient_id])
+        return list(self.alert_log)
+
+    def get_recent_alerts(self, count: int = 50) -> list:
+        """
+        Get the newest alerts, newest first, without copying the full
+        log the way get_alert_history does.
+        """
+        return list(islice(reversed(self.alert_log), count))
\ No newline at end of file
@@ -6,15 +6,29 @@ Supports Gmail and other SMTP providers.
 Falls back to logging if SMTP is not configured.
 """
 
+import atexit
+import enum
 import os
+import queue
 import smtplib
+import string
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
 
 
+@lru_cache(maxsize=1)
 def _load_smtp_config() -> dict:
-    """Load SMTP config from environment or .env file."""
+    """
+    Load SMTP config from environment or .env file.
+
+    Cached for the process lifetime - each per-patient RiskEngine
+    constructs its own notifier, and only the first one should pay
+    for the .env file read and parse.
+    """
     config = {
         "host": os.environ.get("SMTP_HOST", ""),
         "port": int(os.environ.get("SMTP_PORT", "587")),
@@ -54,60 +68,49 @@ def _load_smtp_config() -> dict:
     return config
 
 
-def _format_alert_email(alert: dict) -> tuple:
-    """
-    Format alert data into email subject and HTML body.
+class AlertLevel(enum.Enum):
+    """Alert severity with its display color bound at definition."""
 
-    Returns:
-        (subject, html_body) tuple
-    """
-    level = alert.get("risk_level", "info").upper()
-    name = alert.get("patient_name", "Unknown")
-    pid = alert.get("patient_id", "")
-    score = alert.get("risk_score", 0)
-    reason = alert.get("reason", "")
-    alerts = alert.get("alerts", [])
-    posture = alert.get("posture", {})
-    sub = alert.get("sub_scores", {})
-    ts = datetime.fromtimestamp(alert.get("timestamp", 0)).strftime("%Y-%m-%d %H:%M:%S")
+    CRITICAL = ("CRITICAL", "#f05050")
+    WARNING = ("WARNING", "#f0a030")
+    CAUTION = ("CAUTION", "#e0c040")
+    INFO = ("INFO", "#4a7dff")
 
-    # Color by level
-    color = {
-        "CRITICAL": "#f05050",
-        "WARNING": "#f0a030",
-        "CAUTION": "#e0c040",
-    }.get(level, "#4a7dff")
+    def __init__(self, label: str, color: str):
+        self.label = label
+        self.color = color
 
-    alerts_html = "".join(f"<li>{a}</li>" for a in alerts) if alerts else "<li>None</li>"
+_SUBJECT_TEMPLATE = "[VitalGuard {level}] {name} ({pid}) — Risk Score {score:.0f}/100"
 
-    subject = f"[VitalGuard {level}] {name} ({pid}) — Risk Score {score:.0f}/100"
-
-    body = f"""
+# The ~1.5 KB of static HTML is compiled once at import; per alert we
+# only substitute the dozen dynamic fields instead of re-assembling
+# the whole body from f-string pieces
+_BODY_TEMPLATE = string.Template("""
     <html><body style="font-family:Arial,sans-serif;max-width:600px;margin:0 auto;">
-    <div style="background:{color};color:white;padding:16px 24px;border-radius:8px 8px 0 0;">
-        <h2 style="margin:0;">⚠ VitalGuard Alert — {level}</h2>
-        <p style="margin:4px 0 0;opacity:0.9;">{ts}</p>
+    <div style="background:$color;color:white;padding:16px 24px;border-radius:8px 8px 0 0;">
+        <h2 style="margin:0;">⚠ VitalGuard Alert — $level</h2>
+        <p style="margin:4px 0 0;opacity:0.9;">$ts</p>
     </div>
     <div style="background:#f8f9fa;padding:20px 24px;border:1px solid #e0e0e0;border-top:none;border-radius:0 0 8px 8px;">
-        <h3 style="margin:0 0 8px;">{name} ({pid})</h3>
-        <p style="margin:0 0 16px;"><strong>Risk Score: {score:.0f}/100</strong> — {reason}</p>
+        <h3 style="margin:0 0 8px;">$name ($pid)</h3>
+        <p style="margin:0 0 16px;"><strong>Risk Score: $score/100</strong> — $reason</p>
 
         <table style="width:100%;border-collapse:collapse;margin-bottom:16px;">
             <tr style="background:#e8e8e8;">
                 <th style="padding:8px;text-align:left;">Sub-Score</th>
                 <th style="padding:8px;text-align:right;">Value</th>
             </tr>
-            <tr><td style="padding:6px 8px;">Vitals</td><td style="padding:6px 8px;text-align:right;">{sub.get('vitals',0):.0f}/100</td></tr>
-            <tr style="background:#f0f0f0;"><td style="padding:6px 8px;">Pressure</td><td style="padding:6px 8px;text-align:right;">{sub.get('pressure',0):.0f}/100</td></tr>
-            <tr><td style="padding:6px 8px;">Repositioning</td><td style="padding:6px 8px;text-align:right;">{sub.get('repositioning',0):.0f}/100</td></tr>
-            <tr style="background:#f0f0f0;"><td style="padding:6px 8px;">Movement</td><td style="padding:6px 8px;text-align:right;">{sub.get('movement',0):.0f}/100</td></tr>
-            <tr><td style="padding:6px 8px;">Sound</td><td style="padding:6px 8px;text-align:right;">{sub.get('sound',0):.0f}/100</td></tr>
+            <tr><td style="padding:6px 8px;">Vitals</td><td style="padding:6px 8px;text-align:right;">$vitals/100</td></tr>
+            <tr style="background:#f0f0f0;"><td style="padding:6px 8px;">Pressure</td><td style="padding:6px 8px;text-align:right;">$pressure/100</td></tr>
+            <tr><td style="padding:6px 8px;">Repositioning</td><td style="padding:6px 8px;text-align:right;">$repositioning/100</td></tr>
+            <tr style="background:#f0f0f0;"><td style="padding:6px 8px;">Movement</td><td style="padding:6px 8px;text-align:right;">$movement/100</td></tr>
+            <tr><td style="padding:6px 8px;">Sound</td><td style="padding:6px 8px;text-align:right;">$sound/100</td></tr>
         </table>
 
-        <p><strong>Position:</strong> {posture.get('current','N/A')} ({posture.get('duration_min',0):.0f} min)</p>
+        <p><strong>Position:</strong> $position ($duration min)</p>
 
         <h4 style="margin:16px 0 8px;">Active Alerts:</h4>
-        <ul style="margin:0;padding-left:20px;">{alerts_html}</ul>
+        <ul style="margin:0;padding-left:20px;">$alerts_html</ul>
 
         <p style="margin-top:20px;font-size:12px;color:#888;">
             This is an automated alert from VitalGuard Patient Monitoring System.
@@ -115,7 +118,83 @@ def _format_alert_email(alert: dict) -> tuple:
         </p>
     </div>
     </body></html>
+    """)
+
+
+# Rendered (subject, body) keyed by alert content - steady-state risk
+# evaluation emits near-identical alerts for the same patient within a
+# window, so repeats skip HTML assembly entirely. Bounded FIFO.
+_FORMAT_CACHE = OrderedDict()
+_FORMAT_CACHE_MAX = 256
+
+# Background delivery queue bounds
+_QUEUE_MAX = 1024
+_BATCH_MAX = 32
+_STOP = object()
+
+
+@lru_cache(maxsize=1024)
+def _fmt_ts(ts_int: int) -> str:
+    """Render an alert timestamp, cached per whole second - burst
+    alerts in the same second skip the tz lookup and strftime."""
+    return datetime.fromtimestamp(ts_int).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _format_alert_email(alert: dict) -> tuple:
+    """
+    Format alert data into email subject and HTML body.
+
+    Results are memoized on the alert's rendered content (timestamp
+    excluded - a cache hit reuses the first render's time string).
+
+    Returns:
+        (subject, html_body) tuple
     """
+    level = alert.get("risk_level", "info").upper()
+    name = alert.get("patient_name", "Unknown")
+    pid = alert.get("patient_id", "")
+    score = alert.get("risk_score", 0)
+    alerts = alert.get("alerts", [])
+    posture = alert.get("posture", {})
+    sub = alert.get("sub_scores", {})
+
+    key = (
+        level, pid, name, int(score), alert.get("reason", ""),
+        tuple(alerts), tuple(sorted(sub.items())),
+        posture.get("current", "N/A"), int(posture.get("duration_min", 0)),
+    )
+    cached = _FORMAT_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    subject = _SUBJECT_TEMPLATE.format(level=level, name=name, pid=pid, score=score)
+
+    try:
+        color = AlertLevel[level].color
+    except KeyError:
+        color = AlertLevel.INFO.color
+
+    body = _BODY_TEMPLATE.substitute(
+        color=color,
+        level=level,
+        ts=_fmt_ts(int(alert.get("timestamp", 0))),
+        name=name,
+        pid=pid,
+        score=f"{score:.0f}",
+        reason=alert.get("reason", ""),
+        vitals=f"{sub.get('vitals', 0):.0f}",
+        pressure=f"{sub.get('pressure', 0):.0f}",
+        repositioning=f"{sub.get('repositioning', 0):.0f}",
+        movement=f"{sub.get('movement', 0):.0f}",
+        sound=f"{sub.get('sound', 0):.0f}",
+        position=posture.get("current", "N/A"),
+        duration=f"{posture.get('duration_min', 0):.0f}",
+        alerts_html="".join(f"<li>{a}</li>" for a in alerts) if alerts else "<li>None</li>",
+    )
+
+    _FORMAT_CACHE[key] = (subject, body)
+    if len(_FORMAT_CACHE) > _FORMAT_CACHE_MAX:
+        _FORMAT_CACHE.popitem(last=False)
 
     return subject, body
 
@@ -131,6 +210,144 @@ class EmailNotifier:
         self.config = config or _load_smtp_config()
         self.sent_count = 0
         self.send_log = []
+        # Persistent SMTP session - STARTTLS + AUTH cost hundreds of
+        # ms, so amortize one handshake over many alerts instead of
+        # paying it per send. Recycled after _MAX_PER_CONN messages.
+        self._smtp = None
+        self._conn_sends = 0
+        self._pipelining = False
+        # Background delivery: send_async queues alerts and a daemon
+        # worker drains them in batches via send_batch, keeping SMTP
+        # latency off the caller's (assessment loop's) critical path.
+        # Started lazily on the first send_async call.
+        self._q = None
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        atexit.register(self.close)
+
+    _MAX_PER_CONN = 100
+
+    def _get_server(self):
+        """Return a live SMTP session, reconnecting if needed."""
+        if self._smtp is not None:
+            if self._conn_sends >= self._MAX_PER_CONN:
+                self._reset_connection()
+            else:
+                try:
+                    if self._smtp.noop()[0] == 250:
+                        return self._smtp
+                except (smtplib.SMTPException, OSError):
+                    pass
+                self._reset_connection()
+
+        host = self.config["host"]
+        port = self.config["port"]
+        if port == 465:
+            # Implicit-TLS port: one TLS handshake instead of
+            # plaintext EHLO + STARTTLS + second EHLO
+            server = smtplib.SMTP_SSL(host, port)
+        else:
+            server = smtplib.SMTP(host, port)
+            # Loopback relays don't need (or offer) TLS - skipping
+            # STARTTLS drops the whole negotiation
+            if host not in ("localhost", "127.0.0.1"):
+                server.starttls()
+        server.login(self.config["user"], self.config["password"])
+        # Record whether the server offers PIPELINING so batch callers
+        # can tell commands will stream without per-step round trips
+        self._pipelining = "pipelining" in server.esmtp_features
+        self._smtp = server
+        self._conn_sends = 0
+        return server
+
+    def send_async(self, alert: dict) -> dict:
+        """
+        Queue an alert for background delivery and return immediately.
+
+        The worker thread drains the queue in batches over the
+        persistent session; a full queue drops the alert rather than
+        blocking the caller.
+
+        Args:
+            alert: Alert payload from AlertManager
+
+        Returns:
+            dict with success, detail (queued, not yet delivered)
+        """
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._q = queue.Queue(maxsize=_QUEUE_MAX)
+                    worker = threading.Thread(target=self._drain_loop, daemon=True)
+                    worker.start()
+                    self._worker = worker
+        try:
+            self._q.put_nowait(alert)
+        except queue.Full:
+            return {"success": False, "detail": "Alert queue full, dropped"}
+        return {"success": True, "detail": "Queued for background delivery"}
+
+    def _drain_loop(self):
+        """Worker: batch queued alerts into send_batch calls."""
+        while True:
+            item = self._q.get()
+            if item is _STOP:
+                self._q.task_done()
+                return
+            batch = [item]
+            while len(batch) < _BATCH_MAX:
+                try:
+                    nxt = self._q.get(timeout=0.2)
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    self.send_batch(batch)
+                    for _ in range(len(batch) + 1):
+                        self._q.task_done()
+                    return
+                batch.append(nxt)
+            self.send_batch(batch)
+            for _ in batch:
+                self._q.task_done()
+
+    def flush(self):
+        """Block until every queued alert has been handed to SMTP."""
+        if self._q is not None:
+            self._q.join()
+
+    def _reset_connection(self):
+        """
+        Tear down only the SMTP session so the next send reconnects.
+
+        Unlike close(), this never touches the worker thread, so the
+        reconnect paths in send/send_batch can call it from the worker
+        itself (joining the current thread would raise and kill
+        background delivery for good).
+        """
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+            self._conn_sends = 0
+
+    def close(self):
+        """Drain the background queue and tear down the SMTP session."""
+        if self._worker is not None:
+            self._q.put(_STOP)
+            self._worker.join(timeout=10)
+            self._worker = None
+        self._reset_connection()
+
+    def _build_message(self, subject: str, body: str) -> MIMEMultipart:
+        """Assemble the MIME message for one alert."""
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = self.config["user"]
+        msg["To"] = self.config["recipient"]
+        msg.attach(MIMEText(body, "html"))
+        return msg
 
     def is_configured(self) -> bool:
         """Check if SMTP is properly configured."""
@@ -174,16 +391,18 @@ class EmailNotifier:
 
         # Send via SMTP
         try:
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = self.config["user"]
-            msg["To"] = self.config["recipient"]
-            msg.attach(MIMEText(body, "html"))
+            msg = self._build_message(subject, body)
 
-            with smtplib.SMTP(self.config["host"], self.config["port"]) as server:
-                server.starttls()
-                server.login(self.config["user"], self.config["password"])
+            try:
+                server = self._get_server()
+                server.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # Connection went stale between noop and send - retry
+                # once on a fresh session
+                self._reset_connection()
+                server = self._get_server()
                 server.send_message(msg)
+            self._conn_sends += 1
 
             self.sent_count += 1
             self.send_log.append({"type": "email_sent", "subject": subject})
@@ -191,4 +410,49 @@ class EmailNotifier:
 
         except Exception as e:
             self.send_log.append({"type": "email_error", "error": str(e)})
-            return {"success": False, "detail": str(e)}
\ No newline at end of file
+            return {"success": False, "detail": str(e)}
+
+    def send_batch(self, alerts: list) -> list:
+        """
+        Send many alerts over the persistent SMTP session.
+
+        One STARTTLS/AUTH handshake covers the whole batch. Large
+        batches (30+) abort early once a third of them have failed,
+        so a broken session doesn't burn time on the remainder.
+
+        Args:
+            alerts: List of alert payloads from AlertManager
+
+        Returns:
+            List of per-alert result dicts (partial on early abort)
+        """
+        if not self.is_configured():
+            return [self.send(alert) for alert in alerts]
+
+        results = []
+        failures = 0
+        for alert in alerts:
+            subject, body = _format_alert_email(alert)
+            try:
+                msg = self._build_message(subject, body)
+                try:
+                    server = self._get_server()
+                    server.send_message(msg)
+                except smtplib.SMTPServerDisconnected:
+                    self._reset_connection()
+                    server = self._get_server()
+                    server.send_message(msg)
+                self._conn_sends += 1
+                self.sent_count += 1
+                self.send_log.append({"type": "email_sent", "subject": subject})
+                results.append(
+                    {"success": True, "detail": f"Sent to {self.config['recipient']}"}
+                )
+            except Exception as e:
+                failures += 1
+                self.send_log.append({"type": "email_error", "error": str(e)})
+                results.append({"success": False, "detail": str(e)})
+                if len(alerts) >= 30 and failures >= len(alerts) // 3:
+                    break
+
+        return results
\ No newline at end of file
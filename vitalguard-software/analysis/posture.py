@@ -17,7 +17,9 @@ from typing import Tuple
 
 
 # Gravity vector signatures for each posture (normalized)
-# These represent the dominant axis where gravity pulls
+# These represent the dominant axis where gravity pulls. Kept for
+# reference/tests; classify_posture exploits their axis-aligned
+# structure directly instead of computing dot products against them.
 POSTURE_SIGNATURES = {
     "supine":        (0.0, -1.0, 0.0),
     "prone":         (0.0,  1.0, 0.0),
@@ -60,15 +62,27 @@ def classify_posture(accel_x: float, accel_y: float, accel_z: float) -> dict:
     """
     # Remove gravity bias from Z (sensor mounted with Z pointing up)
     gravity_removed_z = accel_z - 9.81
-    normalized = _normalize(accel_x, accel_y, gravity_removed_z)
-
-    scores = {}
-    for posture, sig in POSTURE_SIGNATURES.items():
-        scores[posture] = round(_cosine_similarity(normalized, sig), 4)
+    nx, ny, _ = _normalize(accel_x, accel_y, gravity_removed_z)
+
+    # The signatures are axis-aligned unit vectors, so each cosine is
+    # just a signed component: supine/prone are -/+ny and the laterals
+    # are +/-nx. The winner is the dominant component with its sign -
+    # two comparisons instead of a similarity search
+    ny_r = round(ny, 4)
+    nx_r = round(nx, 4)
+    scores = {
+        "supine": -ny_r,
+        "prone": ny_r,
+        "left_lateral": nx_r,
+        "right_lateral": -nx_r,
+    }
 
-    # Best match
-    best_posture = max(scores, key=scores.get)
-    best_score = scores[best_posture]
+    if abs(ny_r) >= abs(nx_r):
+        best_posture = "prone" if ny_r > 0 else "supine"
+        best_score = abs(ny_r)
+    else:
+        best_posture = "left_lateral" if nx_r > 0 else "right_lateral"
+        best_score = abs(nx_r)
 
     if best_score < CONFIDENCE_THRESHOLD:
         best_posture = "unknown"
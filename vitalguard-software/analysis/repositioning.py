@@ -6,8 +6,12 @@ when repositioning is overdue. Maintains compliance history.
 """
 
 import time
+from collections import deque
 from config.settings import REPOSITIONING_INTERVAL_MIN, REPOSITIONING_WARNING_MIN
 
+# Bound on retained posture-period history per patient
+_HISTORY_MAX = 2048
+
 
 class RepositioningTracker:
     """Tracks repositioning events and compliance for a single patient."""
@@ -21,7 +25,11 @@ class RepositioningTracker:
         self.warning_min = min(self.interval_min - 15, REPOSITIONING_WARNING_MIN)
         self.current_posture = "unknown"
         self.posture_start_min = 0.0  # elapsed minutes when posture started
-        self.history = []  # list of {posture, start_min, end_min, duration_min}
+        # Bounded history plus running totals so get_compliance stays
+        # O(1) instead of re-summing the whole history per call
+        self.history = deque(maxlen=_HISTORY_MAX)
+        self._on_time = 0
+        self._total_duration = 0.0
         self.total_repositions = 0
         self.overdue_count = 0
 
@@ -43,13 +51,24 @@ class RepositioningTracker:
             if self.current_posture != "unknown":
                 # Log completed posture period
                 duration = elapsed_min - self.posture_start_min
-                self.history.append({
+                entry = {
                     "posture": self.current_posture,
                     "start_min": round(self.posture_start_min, 1),
                     "end_min": round(elapsed_min, 1),
                     "duration_min": round(duration, 1),
                     "was_overdue": duration > self.interval_min,
-                })
+                }
+                # Retire the evicted entry from the running totals
+                # before the bounded deque drops it
+                if len(self.history) == _HISTORY_MAX:
+                    evicted = self.history[0]
+                    if not evicted["was_overdue"]:
+                        self._on_time -= 1
+                    self._total_duration -= evicted["duration_min"]
+                self.history.append(entry)
+                if not entry["was_overdue"]:
+                    self._on_time += 1
+                self._total_duration += entry["duration_min"]
                 self.total_repositions += 1
                 if duration > self.interval_min:
                     self.overdue_count += 1
@@ -98,13 +117,14 @@ class RepositioningTracker:
                 "overdue": 0,
             }
 
-        on_time = sum(1 for h in self.history if not h["was_overdue"])
         return {
-            "compliance_rate": round(on_time / total, 4),
+            "compliance_rate": round(self._on_time / total, 4),
             "total_events": total,
-            "on_time": on_time,
-            "overdue": self.overdue_count,
-            "avg_duration_min": round(
-                sum(h["duration_min"] for h in self.history) / total, 1
-            ),
+            "on_time": self._on_time,
+            # Windowed like the other counts, so on_time + overdue
+            # always equals total_events even after the bounded
+            # history starts evicting (the all-time tally stays
+            # available as overdue_count)
+            "overdue": total - self._on_time,
+            "avg_duration_min": round(self._total_duration / total, 1),
         }
\ No newline at end of file
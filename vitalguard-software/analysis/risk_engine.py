@@ -12,6 +12,8 @@ Risk = weighted combination of:
   - Sound score (10%)
 """
 
+from collections import Counter, deque
+
 from config.settings import RISK_WEIGHTS, ALERT_LEVELS
 from config.patient_profiles import PatientProfile, RiskCategory
 from analysis.posture import classify_from_frame
@@ -21,6 +23,22 @@ from analysis.repositioning import RepositioningTracker
 from analysis.sound import SoundAnalyzer
 
 
+# Base sub-score per classification level - module constants so the
+# per-frame helpers don't rebuild a dict literal for every .get()
+_VITALS_BASE = {"normal": 5, "caution": 45, "critical": 85}
+_SOUND_BASE = {
+    "normal": 0,
+    "silence": 15,
+    "vocalization": 20,
+    "elevated_ambient": 10,
+    "distress": 70,
+}
+
+# Retained readings / alerts per patient (ring buffers)
+_HISTORY_MAX = 10_000
+_ALERTS_MAX = 10_000
+
+
 class RiskEngine:
     """
     Per-patient risk assessment engine.
@@ -38,56 +56,30 @@ class RiskEngine:
             interval_min=patient.reposition_interval_min
         )
         self.sound_analyzer = SoundAnalyzer(window_size=30)
-        self.risk_history = []
-        self.all_alerts = []
-
-    def _vitals_to_score(self, vitals_result: dict) -> float:
-        """Convert vitals analysis to 0-100 sub-score."""
-        level = vitals_result.get("overall_level", "normal")
-        base = {"normal": 5, "caution": 45, "critical": 85}.get(level, 5)
-
-        # Add points for each alert
-        alert_count = len(vitals_result.get("alerts", []))
-        return min(100, base + alert_count * 10)
-
-    def _pressure_to_score(self, pressure_result: dict) -> float:
-        """Convert pressure analysis to 0-100 sub-score."""
-        overall_risk = pressure_result.get("overall", {}).get("overall_risk", 0)
-        return min(100, overall_risk * 100)
-
-    def _reposition_to_score(self, reposition_result: dict) -> float:
-        """Convert repositioning status to 0-100 sub-score."""
-        status = reposition_result.get("status", "ok")
-        remaining = reposition_result.get("remaining_min", 90)
-        interval = reposition_result.get("interval_min", 90)
-
-        if status == "overdue":
-            # How far overdue? More overdue = higher risk
-            overdue_min = reposition_result.get("duration_min", 0) - interval
-            return min(100, 70 + overdue_min * 0.5)
-        elif status == "warning":
-            return 30 + (1 - remaining / interval) * 40
-        else:
-            return max(0, 10 * (1 - remaining / interval))
-
-    def _movement_to_score(self, movement_level: float) -> float:
-        """Convert movement level (0-1) to risk score (less movement = higher risk)."""
-        return min(100, max(0, (1 - movement_level) * 80))
-
-    def _sound_to_score(self, sound_result: dict) -> float:
-        """Convert sound analysis to 0-100 sub-score."""
-        cls = sound_result.get("classification", "normal")
-        base = {
-            "normal": 0,
-            "silence": 15,
-            "vocalization": 20,
-            "elevated_ambient": 10,
-            "distress": 70,
-        }.get(cls, 0)
-
-        # Accumulate for repeated distress
-        distress_count = sound_result.get("distress_count", 0)
-        return min(100, base + distress_count * 5)
+        # Bounded history with running aggregates so long monitoring
+        # runs neither grow without limit nor pay an O(n) scan in
+        # get_risk_summary per call
+        self.risk_history = deque(maxlen=_HISTORY_MAX)
+        self._score_sum = 0.0
+        self._score_max = 0.0
+        self._score_min = 100.0
+        self.all_alerts = deque(maxlen=_ALERTS_MAX)
+        self._alert_counts = Counter()
+        # Compile the weighted sum with the process-constant weights
+        # baked in as literals: assess() then calls one specialized
+        # function with no dict or attribute lookups per frame
+        src = (
+            "def _score(vs, ps, rs, ms, ss):\n"
+            "    return ("
+            f"vs * {RISK_WEIGHTS['vitals']!r}"
+            f" + ps * {RISK_WEIGHTS['pressure']!r}"
+            f" + rs * {RISK_WEIGHTS['repositioning']!r}"
+            f" + ms * {RISK_WEIGHTS['movement']!r}"
+            f" + ss * {RISK_WEIGHTS['sound']!r})\n"
+        )
+        ns = {}
+        exec(src, ns)
+        self._score = ns["_score"]
 
     def assess(self, frame: dict) -> dict:
         """
@@ -129,18 +121,53 @@ class RiskEngine:
         # 6. Movement
         movement_level = vitals.get("movement_level", 0.3)
 
-        # --- Compute sub-scores ---
+        # --- Compute sub-scores (one fused pass) ---
+        # Vitals: base by level plus 10 per active alert
+        vitals_score = min(
+            100,
+            _VITALS_BASE.get(vitals_result.get("overall_level", "normal"), 5)
+            + len(vitals_result.get("alerts", [])) * 10,
+        )
+
+        # Pressure: overall zone risk scaled to 0-100
+        pressure_score = min(
+            100, pressure_result.get("overall", {}).get("overall_risk", 0) * 100
+        )
+
+        # Repositioning: more overdue = higher risk
+        status = reposition_result.get("status", "ok")
+        remaining = reposition_result.get("remaining_min", 90)
+        interval = reposition_result.get("interval_min", 90)
+        if status == "overdue":
+            overdue_min = reposition_result.get("duration_min", 0) - interval
+            reposition_score = min(100, 70 + overdue_min * 0.5)
+        elif status == "warning":
+            reposition_score = 30 + (1 - remaining / interval) * 40
+        else:
+            reposition_score = max(0, 10 * (1 - remaining / interval))
+
+        # Movement: less movement = higher risk
+        movement_score = min(100, max(0, (1 - movement_level) * 80))
+
+        # Sound: base by classification, accumulating repeated distress
+        sound_score = min(
+            100,
+            _SOUND_BASE.get(sound_result.get("classification", "normal"), 0)
+            + sound_result.get("distress_count", 0) * 5,
+        )
+
         scores = {
-            "vitals": self._vitals_to_score(vitals_result),
-            "pressure": self._pressure_to_score(pressure_result),
-            "repositioning": self._reposition_to_score(reposition_result),
-            "movement": self._movement_to_score(movement_level),
-            "sound": self._sound_to_score(sound_result),
+            "vitals": vitals_score,
+            "pressure": pressure_score,
+            "repositioning": reposition_score,
+            "movement": movement_score,
+            "sound": sound_score,
         }
 
-        # --- Weighted total ---
-        total_score = sum(
-            scores[k] * RISK_WEIGHTS[k] for k in RISK_WEIGHTS
+        # --- Weighted total (specialized closure from __init__) ---
+        total_score = self._score(
+            vitals_score, pressure_score, reposition_score,
+            movement_score, sound_score,
         )
         total_score = round(min(100, max(0, total_score)), 1)
 
@@ -200,12 +227,37 @@ class RiskEngine:
             },
         }
 
+        # Retire the reading the full ring is about to drop, lazily
+        # rescanning only when it held the current extremum
+        if len(self.risk_history) == _HISTORY_MAX:
+            evicted = self.risk_history[0]["risk_score"]
+            self._score_sum -= evicted
+            if evicted >= self._score_max or evicted <= self._score_min:
+                rest = [r["risk_score"] for r in self.risk_history]
+                rest[0] = total_score  # slot about to be replaced
+                self._score_max = max(rest)
+                self._score_min = min(rest)
         self.risk_history.append({
             "elapsed_min": elapsed_min,
             "risk_score": total_score,
             "risk_level": risk_level,
         })
-        self.all_alerts.extend(alerts)
+        self._score_sum += total_score
+        if total_score > self._score_max:
+            self._score_max = total_score
+        if total_score < self._score_min:
+            self._score_min = total_score
+
+        for alert in alerts:
+            if len(self.all_alerts) == _ALERTS_MAX:
+                old = self.all_alerts[0]
+                count = self._alert_counts[old] - 1
+                if count:
+                    self._alert_counts[old] = count
+                else:
+                    del self._alert_counts[old]
+            self.all_alerts.append(alert)
+            self._alert_counts[alert] += 1
 
         return result
 
@@ -214,13 +266,13 @@ class RiskEngine:
         if not self.risk_history:
             return {"avg_risk": 0, "max_risk": 0, "current_risk": 0}
 
-        scores = [r["risk_score"] for r in self.risk_history]
+        readings = len(self.risk_history)
         return {
-            "avg_risk": round(sum(scores) / len(scores), 1),
-            "max_risk": round(max(scores), 1),
-            "min_risk": round(min(scores), 1),
-            "current_risk": scores[-1],
-            "readings": len(scores),
+            "avg_risk": round(self._score_sum / readings, 1),
+            "max_risk": round(self._score_max, 1),
+            "min_risk": round(self._score_min, 1),
+            "current_risk": self.risk_history[-1]["risk_score"],
+            "readings": readings,
             "total_alerts": len(self.all_alerts),
-            "unique_alerts": len(set(self.all_alerts)),
+            "unique_alerts": len(self._alert_counts),
         }
\ No newline at end of file
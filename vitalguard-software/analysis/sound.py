@@ -7,7 +7,9 @@ Analyzes microphone data to detect:
 - Silence patterns (may indicate unresponsiveness)
 """
 
-from collections import deque
+from bisect import bisect_right
+
+import numpy as np
 
 
 # ADC thresholds (mapped from dB estimates)
@@ -16,6 +18,11 @@ VOCALIZATION_THRESHOLD = 2400  # ~60 dB
 DISTRESS_THRESHOLD = 2800      # ~70 dB
 SILENCE_THRESHOLD = 600        # ~15 dB (unusually quiet)
 
+# Peak classification as a table lookup: tier 0 defers to the
+# average-level arms, tiers 1-2 classify on peak alone
+_PEAK_EDGES = (VOCALIZATION_THRESHOLD, DISTRESS_THRESHOLD)
+_PEAK_LABELS = (None, "vocalization", "distress")
+
 
 class SoundAnalyzer:
     """Analyzes microphone data over time to detect sound patterns."""
@@ -26,9 +33,24 @@ class SoundAnalyzer:
             window_size: Number of recent readings to keep
         """
         self.window_size = window_size
-        self.history = deque(maxlen=window_size)
+        # Preallocated circular buffer of per-frame averages - window
+        # checks run as array reductions on views instead of
+        # materializing a list from a deque every call
+        self._buf = np.zeros(window_size, dtype=np.float64)
+        self._idx = 0
+        self._filled = 0
         self.vocalization_count = 0
         self.distress_count = 0
+        # Result dict reused across analyze calls to avoid allocating
+        # six entries per frame (see the analyze docstring)
+        self._result = {
+            "average_level": 0.0,
+            "peak_level": 0,
+            "classification": "normal",
+            "vocalization_count": 0,
+            "distress_count": 0,
+            "alerts": [],
+        }
 
     def analyze(self, mic_values: list) -> dict:
         """
@@ -38,26 +60,33 @@ class SoundAnalyzer:
             mic_values: List of 3 microphone ADC values
 
         Returns:
-            dict with average_level, classification, alerts
+            dict with average_level, classification, alerts.
+            The dict is reused between calls - copy it to retain a
+            frame's result past the next analyze call.
         """
         if not mic_values or len(mic_values) < 1:
             return {"average_level": 0, "classification": "no_data", "alerts": []}
 
         avg = sum(mic_values) / len(mic_values)
         peak = max(mic_values)
-        self.history.append(avg)
-
-        alerts = []
-
-        # Classify current sound
-        if peak >= DISTRESS_THRESHOLD:
-            classification = "distress"
-            self.distress_count += 1
-            self.vocalization_count += 1
-            alerts.append(f"Distress vocalization detected (peak ADC: {peak})")
-        elif peak >= VOCALIZATION_THRESHOLD:
-            classification = "vocalization"
-            self.vocalization_count += 1
+        self._buf[self._idx] = avg
+        self._idx = (self._idx + 1) % self.window_size
+        if self._filled < self.window_size:
+            self._filled += 1
+
+        alerts = self._result["alerts"]
+        alerts.clear()
+
+        # Classify current sound: peak tier via table lookup, counters
+        # as branchless bool arithmetic; only the quiet tier needs the
+        # average-level arms
+        tier = bisect_right(_PEAK_EDGES, peak)
+        self.vocalization_count += tier >= 1
+        self.distress_count += tier == 2
+        if tier:
+            classification = _PEAK_LABELS[tier]
+            if tier == 2:
+                alerts.append(f"Distress vocalization detected (peak ADC: {peak})")
         elif avg < SILENCE_THRESHOLD:
             classification = "silence"
         elif avg > AMBIENT_NORMAL_MAX:
@@ -65,20 +94,24 @@ class SoundAnalyzer:
         else:
             classification = "normal"
 
-        # Pattern detection over window
-        if len(self.history) >= 10:
-            recent = list(self.history)[-10:]
-            avg_recent = sum(recent) / len(recent)
+        # Pattern detection over window: last 10 entries end at _idx,
+        # wrapping around the start of the ring buffer
+        if self._filled >= 10:
+            if self._idx >= 10:
+                recent = self._buf[self._idx - 10:self._idx]
+            else:
+                recent = np.concatenate(
+                    (self._buf[self._idx - 10:], self._buf[:self._idx])
+                )
 
             # Sustained silence might indicate unresponsiveness
-            if all(v < SILENCE_THRESHOLD for v in recent):
+            if (recent < SILENCE_THRESHOLD).all():
                 alerts.append("Sustained silence detected — verify patient responsiveness")
 
-        return {
-            "average_level": round(avg, 1),
-            "peak_level": peak,
-            "classification": classification,
-            "vocalization_count": self.vocalization_count,
-            "distress_count": self.distress_count,
-            "alerts": alerts,
-        }
\ No newline at end of file
+        result = self._result
+        result["average_level"] = round(avg, 1)
+        result["peak_level"] = peak
+        result["classification"] = classification
+        result["vocalization_count"] = self.vocalization_count
+        result["distress_count"] = self.distress_count
+        return result
\ No newline at end of file
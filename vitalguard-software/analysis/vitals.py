@@ -6,9 +6,40 @@ to detect trends, anomalies, and threshold breaches.
 Maintains a rolling window for trend detection.
 """
 
-from collections import deque
+import numpy as np
+
 from config.settings import VITALS
 
+# Lookback used by analyze_all's per-frame trend checks; running
+# sufficient statistics are maintained for this window so those calls
+# are O(1) instead of re-fitting the regression from scratch
+_TREND_LOOKBACK = 20
+
+# Tracked parameters in storage order (row index into the ring matrix)
+_PARAMS = ("heart_rate", "body_temp", "spo2", "hrv", "resp_rate")
+_ROW = {param: i for i, param in enumerate(_PARAMS)}
+
+# A reading within this distance of the previous one is considered
+# unchanged (sensor noise floor): while a normal-range vital sits
+# still, analyze_all reuses the last trend instead of re-fitting
+_STABLE_EPS = {
+    "heart_rate": 0.5,   # bpm
+    "body_temp": 0.05,   # °C
+    "spo2": 0.3,         # %
+    "hrv": 0.5,          # ms
+    "resp_rate": 0.3,    # /min
+}
+
+# Hoisted out of analyze_all so the per-frame call doesn't rebuild them
+_LEVEL_PRIORITY = {"normal": 0, "caution": 1, "critical": 2}
+_PARAM_MAP = (
+    ("heart_rate", "heart_rate"),
+    ("body_temp", "temperature"),
+    ("spo2", "spo2"),
+    ("hrv", "hrv"),
+    ("resp_rate", "respiratory_rate"),
+)
+
 
 class VitalSignsAnalyzer:
     """
@@ -22,12 +53,78 @@ class VitalSignsAnalyzer:
             window_size: Number of recent readings to keep for trend analysis
         """
         self.window_size = window_size
-        self.history = {
-            "heart_rate": deque(maxlen=window_size),
-            "body_temp": deque(maxlen=window_size),
-            "spo2": deque(maxlen=window_size),
-            "hrv": deque(maxlen=window_size),
-            "resp_rate": deque(maxlen=window_size),
+        # Columnar float32 ring buffers, one row per vital: a reading
+        # costs 4 bytes instead of a boxed float plus deque node, and
+        # window reductions run over contiguous typed memory
+        self._buf = np.zeros((len(_PARAMS), window_size), dtype=np.float32)
+        self._count = [0] * len(_PARAMS)  # total readings per row
+        # Effective regression window (capped by the history window)
+        self._wlen = min(window_size, _TREND_LOOKBACK)
+        # Per-parameter running Σy and Σi·y over that window, updated
+        # incrementally as readings arrive: the slope over the window
+        # is a closed-form expression in these two sums
+        self._sum_y = dict.fromkeys(_PARAMS, 0.0)
+        self._sum_iy = dict.fromkeys(_PARAMS, 0.0)
+        # Trend results only change when a reading arrives; repeated
+        # detect_trend calls between readings return the cached dict
+        self._trend_dirty = dict.fromkeys(_PARAMS, True)
+        self._trend_cache = {}
+        self._last_value = {}
+        # Compile one classifier per parameter with its thresholds
+        # baked in as literals (same partial-evaluation trick as
+        # RiskEngine's weighted sum): each call runs only the
+        # comparisons that parameter actually configures, with no dict
+        # lookups
+        self._classifiers = {}
+        for param, cfg in VITALS.items():
+            unit = cfg.get("unit", "")
+            lines = ["def _classify(value):"]
+            if "critical_max" in cfg:
+                t = cfg["critical_max"]
+                lines.append(
+                    f"    if value > {t!r}:\n"
+                    f"        return {{'level': 'critical', 'detail': f'{{value}}{unit} exceeds critical max {t}{unit}'}}"
+                )
+            if "critical_min" in cfg:
+                t = cfg["critical_min"]
+                lines.append(
+                    f"    if value < {t!r}:\n"
+                    f"        return {{'level': 'critical', 'detail': f'{{value}}{unit} below critical min {t}{unit}'}}"
+                )
+            if "caution_max" in cfg:
+                t = cfg["caution_max"]
+                lines.append(
+                    f"    if value > {t!r}:\n"
+                    f"        return {{'level': 'caution', 'detail': f'{{value}}{unit} above caution threshold {t}{unit}'}}"
+                )
+            if "caution_min" in cfg:
+                t = cfg["caution_min"]
+                lines.append(
+                    f"    if value < {t!r}:\n"
+                    f"        return {{'level': 'caution', 'detail': f'{{value}}{unit} below caution threshold {t}{unit}'}}"
+                )
+            nmin = cfg.get("normal_min", float("-inf"))
+            nmax = cfg.get("normal_max", float("inf"))
+            checks = []
+            if "normal_min" in cfg:
+                checks.append(f"value < {nmin!r}")
+            if "normal_max" in cfg:
+                checks.append(f"value > {nmax!r}")
+            if checks:
+                lines.append(
+                    f"    if {' or '.join(checks)}:\n"
+                    f"        return {{'level': 'caution', 'detail': f'{{value}}{unit} outside normal range ({nmin}-{nmax}{unit})'}}"
+                )
+            lines.append(
+                f"    return {{'level': 'normal', 'detail': f'{{value}}{unit} within normal range'}}"
+            )
+            ns = {}
+            exec("\n".join(lines), ns)
+            self._classifiers[param] = ns["_classify"]
+        self._trend_threshold = {
+            param: (VITALS.get(param, {}).get("normal_max", 100)
+                    - VITALS.get(param, {}).get("normal_min", 0)) * 0.005
+            for param in _PARAMS
         }
 
     def add_reading(self, vitals: dict):
@@ -37,9 +134,29 @@ class VitalSignsAnalyzer:
         Args:
             vitals: dict with heart_rate, body_temp, spo2, hrv, resp_rate
         """
-        for key in self.history:
+        wl = self._wlen
+        size = self.window_size
+        for key, row in _ROW.items():
             if key in vitals:
-                self.history[key].append(vitals[key])
+                # Store at float32 precision and feed the running sums
+                # the same rounded value, so eviction stays exact
+                y = float(np.float32(vitals[key]))
+                n = self._count[row]
+                # Slide the regression window: when full, every retained
+                # reading's index drops by one (subtract Σy, restore the
+                # evicted term) and the new reading enters at the end
+                if n >= wl:
+                    evicted = float(self._buf[row, (n - wl) % size])
+                    self._sum_iy[key] += (
+                        evicted - self._sum_y[key] + (wl - 1) * y
+                    )
+                    self._sum_y[key] += y - evicted
+                else:
+                    self._sum_iy[key] += n * y
+                    self._sum_y[key] += y
+                self._buf[row, n % size] = y
+                self._count[row] = n + 1
+                self._trend_dirty[key] = True
 
     def classify_value(self, param: str, value: float) -> dict:
         """
@@ -52,28 +169,10 @@ class VitalSignsAnalyzer:
         Returns:
             dict with level ('normal', 'caution', 'critical'), detail string
         """
-        cfg = VITALS.get(param, {})
-        unit = cfg.get("unit", "")
-
-        # Check critical thresholds
-        if "critical_max" in cfg and value > cfg["critical_max"]:
-            return {"level": "critical", "detail": f"{value}{unit} exceeds critical max {cfg['critical_max']}{unit}"}
-        if "critical_min" in cfg and value < cfg["critical_min"]:
-            return {"level": "critical", "detail": f"{value}{unit} below critical min {cfg['critical_min']}{unit}"}
-
-        # Check caution thresholds
-        if "caution_max" in cfg and value > cfg["caution_max"]:
-            return {"level": "caution", "detail": f"{value}{unit} above caution threshold {cfg['caution_max']}{unit}"}
-        if "caution_min" in cfg and value < cfg["caution_min"]:
-            return {"level": "caution", "detail": f"{value}{unit} below caution threshold {cfg['caution_min']}{unit}"}
-
-        # Check normal range
-        normal_min = cfg.get("normal_min", float("-inf"))
-        normal_max = cfg.get("normal_max", float("inf"))
-        if value < normal_min or value > normal_max:
-            return {"level": "caution", "detail": f"{value}{unit} outside normal range ({normal_min}-{normal_max}{unit})"}
-
-        return {"level": "normal", "detail": f"{value}{unit} within normal range"}
+        fn = self._classifiers.get(param)
+        if fn is None:
+            return {"level": "normal", "detail": f"{value} within normal range"}
+        return fn(value)
 
     def detect_trend(self, param: str, lookback: int = 20) -> dict:
         """
@@ -86,26 +185,46 @@ class VitalSignsAnalyzer:
         Returns:
             dict with direction ('rising', 'falling', 'stable'), slope, magnitude
         """
-        data = list(self.history.get(param, []))
-        if len(data) < max(5, lookback // 2):
+        row = _ROW.get(param)
+        count = self._count[row] if row is not None else 0
+        if min(count, self.window_size) < max(5, lookback // 2):
             return {"direction": "insufficient_data", "slope": 0.0, "magnitude": 0.0}
 
-        recent = data[-lookback:]
-        n = len(recent)
+        size = self.window_size
+        if lookback == _TREND_LOOKBACK:
+            # Hot path (analyze_all): read the running sums - the
+            # centered denominator depends only on n, so the slope is a
+            # closed-form O(1) lookup. Unchanged history since the last
+            # call means an identical result
+            if not self._trend_dirty.get(param, True):
+                return self._trend_cache[param]
+            n = min(count, self._wlen)
+            x_mean = (n - 1) / 2
+            denominator = n * (n * n - 1) / 12
+            numerator = self._sum_iy[param] - x_mean * self._sum_y[param]
+            newest = float(self._buf[row, (count - 1) % size])
+            oldest = float(self._buf[row, (count - n) % size])
+        else:
+            start = max(0, count - size, count - lookback)
+            recent = [float(self._buf[row, i % size]) for i in range(start, count)]
+            n = len(recent)
 
-        # Simple linear regression
-        x_mean = (n - 1) / 2
-        y_mean = sum(recent) / n
-        numerator = sum((i - x_mean) * (y - y_mean) for i, y in enumerate(recent))
-        denominator = sum((i - x_mean) ** 2 for i in range(n))
+            # Simple linear regression
+            x_mean = (n - 1) / 2
+            y_mean = sum(recent) / n
+            numerator = sum((i - x_mean) * (y - y_mean) for i, y in enumerate(recent))
+            denominator = sum((i - x_mean) ** 2 for i in range(n))
+            newest, oldest = recent[-1], recent[0]
 
         slope = numerator / denominator if denominator > 0 else 0.0
 
         # Classify trend
         # Threshold depends on the parameter's normal range
-        cfg = VITALS.get(param, {})
-        normal_range = cfg.get("normal_max", 100) - cfg.get("normal_min", 0)
-        threshold = normal_range * 0.005  # 0.5% of normal range per reading
+        # (0.5% of normal range per reading, precomputed in __init__)
+        threshold = self._trend_threshold.get(param)
+        if threshold is None:
+            cfg = VITALS.get(param, {})
+            threshold = (cfg.get("normal_max", 100) - cfg.get("normal_min", 0)) * 0.005
 
         if slope > threshold:
             direction = "rising"
@@ -115,14 +234,18 @@ class VitalSignsAnalyzer:
             direction = "stable"
 
         # Magnitude: how much change over the lookback period
-        magnitude = abs(recent[-1] - recent[0]) if len(recent) > 1 else 0.0
+        magnitude = abs(newest - oldest) if n > 1 else 0.0
 
-        return {
+        result = {
             "direction": direction,
             "slope": round(slope, 6),
             "magnitude": round(magnitude, 2),
             "readings_analyzed": n,
         }
+        if lookback == _TREND_LOOKBACK:
+            self._trend_cache[param] = result
+            self._trend_dirty[param] = False
+        return result
 
     def analyze_all(self, current_vitals: dict) -> dict:
         """
@@ -138,23 +261,25 @@ class VitalSignsAnalyzer:
 
         results = {}
         worst_level = "normal"
-        level_priority = {"normal": 0, "caution": 1, "critical": 2}
-
-        param_map = {
-            "heart_rate": "heart_rate",
-            "body_temp": "temperature",
-            "spo2": "spo2",
-            "hrv": "hrv",
-            "resp_rate": "respiratory_rate",
-        }
 
-        for key, config_key in param_map.items():
+        for key, config_key in _PARAM_MAP:
             value = current_vitals.get(key)
             if value is None:
                 continue
 
             classification = self.classify_value(config_key, value)
-            trend = self.detect_trend(key)
+
+            # Stable gate: a normal reading that barely moved can't
+            # have changed the trend meaningfully - reuse the last one
+            prev = self._last_value.get(key)
+            if (prev is not None
+                    and classification["level"] == "normal"
+                    and abs(value - prev) < _STABLE_EPS[key]
+                    and key in self._trend_cache):
+                trend = self._trend_cache[key]
+            else:
+                trend = self.detect_trend(key)
+            self._last_value[key] = value
 
             results[key] = {
                 "value": value,
@@ -163,7 +288,7 @@ class VitalSignsAnalyzer:
             }
 
             # Track worst level
-            if level_priority.get(classification["level"], 0) > level_priority.get(worst_level, 0):
+            if _LEVEL_PRIORITY.get(classification["level"], 0) > _LEVEL_PRIORITY.get(worst_level, 0):
                 worst_level = classification["level"]
 
         # Flag dangerous combinations
@@ -189,5 +314,5 @@ class VitalSignsAnalyzer:
             "parameters": results,
             "overall_level": worst_level,
             "alerts": alerts,
-            "readings_in_window": len(self.history["heart_rate"]),
+            "readings_in_window": min(self._count[_ROW["heart_rate"]], self.window_size),
         }
\ No newline at end of file
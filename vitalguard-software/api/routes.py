@@ -27,10 +27,18 @@ async def root():
 @router.get("/patients")
 async def get_patients():
     """Get list of all patients with current risk status."""
+    # Twin state only changes when the simulation loop ticks, so polls
+    # between broadcasts reuse the list assembled on the last build
+    tick = _sim_state.get("tick", 0)
+    cached = _sim_state.get("patients_cache")
+    if cached and cached[0] == tick:
+        return cached[1]
+
     twins = _sim_state.get("twins", {})
+    snapshot = _sim_state.get("dashboard_snapshot", {})
     patients = []
     for pid, twin in twins.items():
-        state = twin.to_dashboard_state()
+        state = snapshot.get(pid) or twin.to_dashboard_state()
         patients.append({
             "patient_id": state["patient_id"],
             "patient_name": state["patient_name"],
@@ -43,14 +51,18 @@ async def get_patients():
     # Sort by risk (critical first)
     level_order = {"critical": 0, "warning": 1, "caution": 2, "info": 3}
     patients.sort(key=lambda p: (level_order.get(p["risk_level"], 9), -p["risk_score"]))
-    return {"patients": patients, "count": len(patients)}
+    result = {"patients": patients, "count": len(patients)}
+    _sim_state["patients_cache"] = (tick, result)
+    return result
 
 
 @router.get("/patients/{patient_id}")
 async def get_patient_detail(patient_id: str):
     """Get full digital twin state for a specific patient."""
-    twins = _sim_state.get("twins", {})
-    twin = twins.get(patient_id)
+    state = _sim_state.get("dashboard_snapshot", {}).get(patient_id)
+    if state:
+        return state
+    twin = _sim_state.get("twins", {}).get(patient_id)
     if not twin:
         return {"error": f"Patient {patient_id} not found"}
     return twin.to_dashboard_state()
@@ -72,9 +84,9 @@ async def get_alerts():
     alert_mgr = _sim_state.get("alert_manager")
     if not alert_mgr:
         return {"alerts": []}
-    history = alert_mgr.get_alert_history()
-    # Return last 50 alerts, newest first
-    return {"alerts": history[-50:][::-1], "total": len(history)}
+    # Last 50 alerts, newest first, without copying the full log
+    return {"alerts": alert_mgr.get_recent_alerts(50),
+            "total": len(alert_mgr.alert_log)}
 
 
 @router.get("/status")
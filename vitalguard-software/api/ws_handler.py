@@ -5,9 +5,10 @@ Manages WebSocket connections for real-time dashboard updates.
 Broadcasts digital twin state to all connected clients.
 """
 
-import json
 import asyncio
 from typing import Set
+
+import orjson
 from fastapi import WebSocket
 
 
@@ -31,14 +32,27 @@ class ConnectionManager:
         Send data to all connected clients.
         Automatically removes dead connections.
         """
-        dead = set()
-        for ws in self.active_connections:
+        if not self.active_connections:
+            return
+
+        # Serialize once for all clients (orjson, then decode - the
+        # dashboard client expects text frames)
+        payload = orjson.dumps(data).decode()
+
+        async def _safe(ws: WebSocket):
+            """Send to one client; return the socket if it's dead."""
             try:
-                await ws.send_text(json.dumps(data))
+                await asyncio.wait_for(ws.send_text(payload), timeout=1.0)
+                return None
             except Exception:
-                dead.add(ws)
-        for ws in dead:
-            self.active_connections.discard(ws)
+                return ws
+
+        # Dispatch all sends concurrently so one slow client's TCP
+        # backpressure doesn't stall everyone else's frame
+        results = await asyncio.gather(
+            *(_safe(ws) for ws in list(self.active_connections))
+        )
+        self.active_connections.difference_update(r for r in results if r)
 
     @property
     def client_count(self) -> int:
@@ -233,6 +233,48 @@ def generate_combined_frame(state: SyntheticState) -> dict:
     }
 
 
+def generate_combined_frames(
+    state: SyntheticState,
+    vitals_rows,
+    movement,
+    interval_sec: float = 1.0,
+    postures=None,
+) -> list:
+    """
+    Render a batch of combined frames from precomputed columnar state.
+
+    Callers that compute their whole timeline up front (the experiment
+    generators) hand over the per-frame vitals and movement in one call
+    instead of mutating the state attribute-by-attribute around
+    repeated generate_combined_frame calls.
+
+    Args:
+        state: SyntheticState to evolve
+        vitals_rows: Sequence of (heart_rate, body_temp, spo2, hrv,
+                     resp_rate) rows, one per frame
+        movement: Sequence of movement_level values, one per frame
+        interval_sec: Time between frames in seconds
+        postures: Optional sequence of posture names; a change from the
+                  current posture resets posture_duration_min
+
+    Returns:
+        List of combined frames
+    """
+    frames = []
+    for i, row in enumerate(vitals_rows):
+        (state.heart_rate, state.body_temp, state.spo2,
+         state.hrv, state.resp_rate) = row
+        state.movement_level = movement[i]
+        if postures is not None:
+            posture = postures[i]
+            if posture != state.posture:
+                state.posture_duration_min = 0.0
+                state.posture = posture
+        state.advance(interval_sec)
+        frames.append(generate_combined_frame(state))
+    return frames
+
+
 def stream_patient_data(
     state: SyntheticState,
     duration_min: float = 60,
@@ -109,6 +109,9 @@ for frame in frames_c:
 check("Crisis patient triggers alerts", alert_count_c >= 1,
       f"got {alert_count_c}")
 check("Alert history recorded", len(manager2.get_alert_history()) >= 1)
+# Delivery happens on the notifier's background thread - wait for the
+# queue to drain before counting sends
+email2.flush()
 check("Email notifier received alerts", email2.sent_count >= 1,
       f"sent={email2.sent_count}")
 